@@ -1,12 +1,17 @@
 """
 Database models and session management for OAuth tokens.
 """
+import asyncio
 import os
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Generator
-from sqlalchemy import create_engine, Column, String, Boolean, DateTime, Text, JSON
+from typing import Optional, List, Dict, Any, Generator, AsyncGenerator
+from sqlalchemy import create_engine, text, Column, String, Boolean, DateTime, Text, JSON, Index
+from sqlalchemy.engine import make_url
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
 import uuid
 
 try:
@@ -21,6 +26,9 @@ except ImportError:
 
 Base = declarative_base()
 
+# Native JSON column (JSONB on PostgreSQL) so rows come back as Python lists
+_JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 
 class FacebookToken(Base):
     """Model for storing Facebook OAuth tokens."""
@@ -31,13 +39,20 @@ class FacebookToken(Base):
     fb_user_id = Column(String(64), nullable=False)
     encrypted_access_token = Column(Text, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=True)
-    permissions = Column(JSON, nullable=True)  # List of granted permissions
-    accounts = Column(JSON, nullable=True)  # Array of {id, name, role}
+    permissions = Column(_JSONType, nullable=True)  # List of granted permissions
+    accounts = Column(_JSONType, nullable=True)  # Array of {id, name, role}
     revoked = Column(Boolean, default=False)
     last_refreshed = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        # Supports the refresh worker's "active and expiring soon" range scan
+        Index("ix_facebook_tokens_revoked_expires_at", "revoked", "expires_at"),
+        # Active-token probes and "newest active connection" lookups
+        Index("ix_facebook_tokens_revoked_created_at", "revoked", "created_at"),
+    )
+
 
 class OAuthState(Base):
     """Model for storing OAuth state tokens (CSRF protection)."""
@@ -52,6 +67,16 @@ class OAuthState(Base):
 # Database setup
 _engine = None
 _SessionLocal = None
+_AsyncSessionLocal = None
+
+# Connection pool sizing for the web server's async engine
+ASYNC_POOL_SIZE = 20
+ASYNC_POOL_WARM_SIZE = 5
+
+# asyncpg keeps prepared statements per connection; SQLAlchemy keeps its own
+# per-connection cache of prepared statement handles on top of that
+ASYNCPG_STATEMENT_CACHE_SIZE = 1024
+ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE = 512
 
 
 def init_database() -> None:
@@ -96,13 +121,17 @@ def init_database() -> None:
         )
 
         # Test connection
-        from sqlalchemy import text
         with _engine.connect() as conn:
             conn.execute(text("SELECT 1"))
 
         # Create tables
         Base.metadata.create_all(bind=_engine)
 
+        # create_all() skips tables that already exist, so make sure indexes
+        # added after the initial deployment are present as well
+        for index in FacebookToken.__table__.indexes:
+            index.create(bind=_engine, checkfirst=True)
+
         _SessionLocal = sessionmaker(
             autocommit=False,
             autoflush=False,
@@ -118,6 +147,88 @@ def init_database() -> None:
         raise  # Re-raise to make the error visible
 
 
+def _to_async_url(database_url: str) -> str:
+    """Map a sync database URL onto its asyncio driver (aiosqlite / asyncpg)."""
+    scheme, sep, rest = database_url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return database_url
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the shared asyncio engine used by the web server's request handlers.
+
+    The engine (and its connection pool) is created once per process.
+    """
+    # Tables and indexes are created through the sync engine
+    init_database()
+
+    database_url = _to_async_url(settings.database_url)
+
+    connect_args = {}
+    if database_url.startswith("postgresql"):
+        connect_args = {
+            "timeout": 30,  # 30 second connection timeout
+            "statement_cache_size": ASYNCPG_STATEMENT_CACHE_SIZE,
+        }
+        # The dialect-level prepared statement cache is configured through the URL
+        database_url = make_url(database_url).update_query_dict(
+            {"prepared_statement_cache_size": str(ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE)}
+        )
+
+    return create_async_engine(
+        database_url,
+        connect_args=connect_args,
+        pool_pre_ping=True,  # Verify connections before using
+        pool_recycle=1800,   # Recycle connections after 30 minutes
+        pool_size=ASYNC_POOL_SIZE,
+        max_overflow=10,     # Allow overflow connections
+        pool_timeout=30,     # Wait up to 30s for connection
+        echo=False,          # Don't log SQL
+    )
+
+
+def init_async_database() -> None:
+    """Initialize the asyncio engine and session factory."""
+    global _AsyncSessionLocal
+
+    if _AsyncSessionLocal is not None:
+        return
+
+    _AsyncSessionLocal = async_sessionmaker(
+        get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,  # keep attributes accessible after commit
+    )
+
+
+async def warm_async_pool(connections: int = ASYNC_POOL_WARM_SIZE) -> None:
+    """Open pooled connections up front so the first requests skip the handshake."""
+    engine = get_async_engine()
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Hold the connections concurrently so each ping gets its own connection
+    await asyncio.gather(*(_ping() for _ in range(connections)))
+    logger.info(f"Warmed async database pool with {connections} connection(s)")
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get an async database session (FastAPI dependency)."""
+    if _AsyncSessionLocal is None:
+        init_async_database()
+
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
 def get_db() -> Generator[Session, None, None]:
     """Get database session."""
     if _SessionLocal is None:
@@ -176,8 +287,8 @@ def clear_oauth_tokens() -> int:
     """
     db = get_db_session()
     try:
-        count = db.query(FacebookToken).count()
-        db.query(FacebookToken).delete()
+        # delete() reports the number of rows removed, so no separate count query
+        count = db.query(FacebookToken).delete()
         db.query(OAuthState).delete()  # Also clear expired states
         db.commit()
         logger.info(f"Cleared {count} OAuth tokens from database")
@@ -1,10 +1,13 @@
 """
 Facebook OAuth service for handling authentication flows.
 """
+import asyncio
 import secrets
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 from urllib.parse import urlencode
 
 try:
@@ -22,12 +25,40 @@ except ImportError:
     from auth.encryption import get_encryption
 
 
+def _mark_active_tokens_dirty():
+    """Tell the refresh worker a token was stored so its next run isn't skipped."""
+    # Lazy import: the refresh worker imports this module at load time
+    try:
+        from .token_refresh_worker import mark_active_tokens_dirty
+    except ImportError:
+        from auth.token_refresh_worker import mark_active_tokens_dirty
+    mark_active_tokens_dirty()
+
+
 class FacebookOAuthService:
     """Service for handling Facebook OAuth flows."""
     
     def __init__(self):
         self.encryption = get_encryption()
         self.base_url = f"https://graph.facebook.com/{settings.fb_api_version}"
+
+        # Shared HTTP session so Graph API calls reuse keep-alive connections.
+        # The pool must be at least as large as the refresh worker's concurrency.
+        self.http = requests.Session()
+        pool_size = max(settings.connection_pool_per_host, settings.token_refresh_concurrency)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+
+        # Async session for Graph API calls made from the web server's handlers
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Bumped whenever stored tokens change so callers can invalidate caches
+        self.token_version = 0
+    
+    def mark_tokens_changed(self) -> None:
+        """Record that stored tokens were added, updated or revoked."""
+        self.token_version += 1
     
     def generate_state(self, user_id: Optional[str] = None) -> str:
         """
@@ -158,7 +189,7 @@ class FacebookOAuthService:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -190,7 +221,7 @@ class FacebookOAuthService:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -220,7 +251,7 @@ class FacebookOAuthService:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -246,7 +277,7 @@ class FacebookOAuthService:
 
         while current_url and page_count < max_pages:
             try:
-                response = requests.get(current_url, params=current_params if page_count == 0 else None, timeout=30)
+                response = self.http.get(current_url, params=current_params if page_count == 0 else None, timeout=30)
                 response.raise_for_status()
                 data = response.json()
 
@@ -398,13 +429,203 @@ class FacebookOAuthService:
 
         return formatted_accounts
     
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Ensure the async HTTP session is available."""
+        if self._session is None or self._session.closed:
+            # Keep connections to graph.facebook.com alive between requests
+            connector = aiohttp.TCPConnector(
+                limit_per_host=settings.connection_pool_per_host,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,  # DNS cache for 5 minutes
+            )
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30, connect=10),
+                connector=connector
+            )
+        return self._session
+
+    async def open_session(self) -> None:
+        """Create the async HTTP session up front so the first login doesn't pay for it."""
+        await self._ensure_session()
+
+    async def close_session(self) -> None:
+        """Close the async HTTP session."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def _get_json_async(self, url: str, params: Optional[Dict[str, Any]] = None,
+                              timeout: float = 10) -> Dict[str, Any]:
+        """GET a Graph API URL without blocking the event loop and decode the JSON body."""
+        session = await self._ensure_session()
+        if params:
+            # Match requests, which drops None-valued query parameters
+            params = {key: value for key, value in params.items() if value is not None}
+        async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def exchange_code_for_token_async(self, code: str) -> Dict[str, Any]:
+        """Async version of exchange_code_for_token()."""
+        url = f"{self.base_url}/oauth/access_token"
+        params = {
+            "client_id": settings.fb_app_id,
+            "client_secret": settings.fb_app_secret,
+            "redirect_uri": settings.fb_redirect_uri,
+            "code": code
+        }
+        
+        try:
+            data = await self._get_json_async(url, params)
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to exchange code for token: {e}")
+            raise
+        
+        if "error" in data:
+            logger.error(f"Token exchange error: {data['error']}")
+            raise Exception(f"Facebook API error: {data['error'].get('message', 'Unknown error')}")
+        
+        return data
+    
+    async def exchange_short_token_for_long_async(self, short_token: str) -> Dict[str, Any]:
+        """Async version of exchange_short_token_for_long()."""
+        url = f"{self.base_url}/oauth/access_token"
+        params = {
+            "grant_type": "fb_exchange_token",
+            "client_id": settings.fb_app_id,
+            "client_secret": settings.fb_app_secret,
+            "fb_exchange_token": short_token
+        }
+        
+        try:
+            data = await self._get_json_async(url, params)
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to exchange for long token: {e}")
+            raise
+        
+        if "error" in data:
+            logger.error(f"Long token exchange error: {data['error']}")
+            raise Exception(f"Facebook API error: {data['error'].get('message', 'Unknown error')}")
+        
+        return data
+    
+    async def get_user_info_async(self, access_token: str) -> Dict[str, Any]:
+        """Async version of get_user_info()."""
+        url = f"{self.base_url}/me"
+        params = {
+            "access_token": access_token,
+            "fields": "id,name"
+        }
+        
+        try:
+            return await self._get_json_async(url, params)
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to get user info: {e}")
+            raise
+    
+    async def _fetch_paginated_data_async(self, url: str, params: Dict[str, Any],
+                                          max_pages: int = 50) -> List[Dict[str, Any]]:
+        """Async version of _fetch_paginated_data()."""
+        all_data = []
+        current_url = url
+        current_params = params.copy()
+        page_count = 0
+
+        while current_url and page_count < max_pages:
+            try:
+                data = await self._get_json_async(current_url, current_params, timeout=30)
+
+                # Add items from this page
+                items = data.get("data", [])
+                all_data.extend(items)
+                page_count += 1
+
+                logger.debug(f"Fetched page {page_count} with {len(items)} items (total: {len(all_data)})")
+
+                # Check for next page
+                current_url = data.get("paging", {}).get("next")
+                current_params = None  # Next URL already has params
+            except Exception as e:
+                logger.warning(f"Error fetching page {page_count + 1}: {e}")
+                break
+
+        logger.info(f"Fetched {len(all_data)} total items across {page_count} pages")
+        return all_data
+
+    async def get_ad_accounts_async(self, access_token: str) -> List[Dict[str, Any]]:
+        """
+        Async version of get_ad_accounts().
+
+        The owned and client account listings of every business are fetched
+        concurrently instead of one business at a time.
+        """
+        account_fields = "id,name,account_id,currency,account_status"
+        formatted_accounts = []
+
+        # Method 1: Try getting through businesses (with business_management permission)
+        try:
+            logger.info("Fetching businesses for ad account access")
+            businesses = await self._fetch_paginated_data_async(
+                f"{self.base_url}/me/businesses",
+                {"access_token": access_token, "fields": "id,name", "limit": 100}
+            )
+            logger.info(f"Found {len(businesses)} businesses")
+
+            listing_params = {"access_token": access_token, "fields": account_fields, "limit": 100}
+            listings = await asyncio.gather(*(
+                self._fetch_paginated_data_async(f"{self.base_url}/{business.get('id')}/{edge}", listing_params)
+                for business in businesses
+                for edge in ("owned_ad_accounts", "client_ad_accounts")
+            ))
+
+            for index, business in enumerate(businesses):
+                business_id = business.get("id")
+                owned_accounts, client_accounts = listings[2 * index], listings[2 * index + 1]
+                for account in owned_accounts + client_accounts:
+                    formatted_accounts.append({
+                        "id": account.get("id"),
+                        "name": account.get("name"),
+                        "account_id": account.get("account_id"),
+                        "currency": account.get("currency"),
+                        # account_status may be restricted on some client accounts
+                        "status": account.get("account_status"),
+                        "business_id": business_id
+                    })
+
+                logger.info(
+                    f"Total for business {business.get('name', 'Unknown')}: {len(owned_accounts)} owned + "
+                    f"{len(client_accounts)} client = {len(owned_accounts) + len(client_accounts)} accounts"
+                )
+        except Exception as e:
+            logger.debug(f"Could not get ad accounts through businesses: {e}")
+
+        # Method 2: Fallback to direct /me/adaccounts (if ads_management permission available)
+        if not formatted_accounts:
+            logger.info("Fetching ad accounts via direct /me/adaccounts endpoint")
+            accounts = await self._fetch_paginated_data_async(
+                f"{self.base_url}/me/adaccounts",
+                {"access_token": access_token, "fields": account_fields, "limit": 100}
+            )
+            formatted_accounts = [
+                {
+                    "id": account.get("id"),
+                    "name": account.get("name"),
+                    "account_id": account.get("account_id"),
+                    "currency": account.get("currency"),
+                    "status": account.get("account_status")
+                }
+                for account in accounts
+            ]
+
+        return formatted_accounts
+    
     def save_token(
         self,
         user_id: Optional[str],
         fb_user_id: str,
         access_token: str,
         expires_in: int,
-        permissions: Optional[List[str]] = None,
+        permissions: Optional[Sequence[str]] = None,
         accounts: Optional[List[Dict[str, Any]]] = None
     ) -> FacebookToken:
         """
@@ -443,6 +664,8 @@ class FacebookOAuthService:
                 existing.revoked = False
                 existing.updated_at = datetime.now(timezone.utc)
                 db.commit()
+                _mark_active_tokens_dirty()
+                self.mark_tokens_changed()
                 # Make attributes accessible before closing session
                 result_id = existing.id
                 result_fb_user_id = existing.fb_user_id
@@ -461,6 +684,8 @@ class FacebookOAuthService:
                 )
                 db.add(token_record)
                 db.commit()
+                _mark_active_tokens_dirty()
+                self.mark_tokens_changed()
                 db.refresh(token_record)
                 # Make attributes accessible before closing session
                 result_id = token_record.id
@@ -526,19 +751,22 @@ class FacebookOAuthService:
         finally:
             db.close()
     
-    def refresh_token(self, token_record: FacebookToken) -> bool:
+    def refresh_token(self, encrypted_access_token: str) -> Optional[Tuple[str, datetime]]:
         """
         Refresh a long-lived token by re-exchanging it.
+
+        Does not touch the database, so it is safe to call from worker
+        threads; the caller persists the result.
         
         Args:
-            token_record: FacebookToken record to refresh
+            encrypted_access_token: Stored (encrypted) access token
             
         Returns:
-            True if refresh successful
+            Tuple of (encrypted new token, new expiry), or None if refresh failed
         """
         try:
             # Decrypt current token
-            current_token = self.encryption.decrypt(token_record.encrypted_access_token)
+            current_token = self.encryption.decrypt(encrypted_access_token)
             
             # Exchange for new long token
             response = self.exchange_short_token_for_long(current_token)
@@ -546,29 +774,80 @@ class FacebookOAuthService:
             new_token = response.get("access_token")
             expires_in = response.get("expires_in", 5184000)  # Default 60 days
             
-            # Update token record
             encrypted_token = self.encryption.encrypt(new_token)
             expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-            
-            db = get_db_session()
-            try:
-                token_record.encrypted_access_token = encrypted_token
-                token_record.expires_at = expires_at
-                token_record.last_refreshed = datetime.now(timezone.utc)
-                db.commit()
-                logger.info(f"Refreshed token for FB user: {token_record.fb_user_id}")
-                return True
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Failed to update refreshed token: {e}")
-                return False
-            finally:
-                db.close()
-                
+            return encrypted_token, expires_at
         except Exception as e:
             logger.error(f"Failed to refresh token: {e}")
-            return False
+            return None
     
+    def revoke_on_meta(self, fb_user_id: str, access_token: str) -> bool:
+        """
+        Invalidate a token on Meta's servers via DELETE /{user-id}/permissions.
+
+        Does not touch the local database.
+
+        Args:
+            fb_user_id: Facebook user ID
+            access_token: Plaintext access token
+
+        Returns:
+            True if Meta confirmed the revocation
+        """
+        try:
+            # Delete all permissions - this invalidates the token on Meta's servers
+            url = f"{self.base_url}/{fb_user_id}/permissions"
+
+            logger.info(f"Calling Meta API to revoke token for user: {fb_user_id}")
+            response = self.http.delete(
+                url,
+                params={"access_token": access_token},
+                timeout=10
+            )
+
+            response.raise_for_status()
+
+            # Check response
+            data = response.json()
+            if data.get("success"):
+                logger.info(f"✅ Successfully revoked token on Meta API for user: {fb_user_id}")
+                return True
+
+            logger.warning(f"Meta API revocation returned unexpected response: {data}")
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"Meta API revocation failed with HTTP error: {e}")
+        except Exception as e:
+            logger.error(f"Failed to revoke token on Meta API: {e}")
+
+        return False
+
+    async def revoke_on_meta_async(self, fb_user_id: str, access_token: str) -> bool:
+        """Async version of revoke_on_meta()."""
+        try:
+            url = f"{self.base_url}/{fb_user_id}/permissions"
+
+            logger.info(f"Calling Meta API to revoke token for user: {fb_user_id}")
+            session = await self._ensure_session()
+            async with session.delete(
+                url,
+                params={"access_token": access_token},
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+
+            if data.get("success"):
+                logger.info(f"✅ Successfully revoked token on Meta API for user: {fb_user_id}")
+                return True
+
+            logger.warning(f"Meta API revocation returned unexpected response: {data}")
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"Meta API revocation failed with HTTP error: {e}")
+        except Exception as e:
+            logger.error(f"Failed to revoke token on Meta API: {e}")
+
+        return False
+
     def revoke_token(self, fb_user_id: str, call_meta_api: bool = True) -> bool:
         """
         Revoke token both on Meta's servers and locally.
@@ -605,36 +884,13 @@ class FacebookOAuthService:
                 token_record.revoked = True
                 token_record.updated_at = datetime.now(timezone.utc)
                 db.commit()
+                self.mark_tokens_changed()
                 return False
 
             # Step 2: Call Meta API to actually invalidate the token (if requested)
             if call_meta_api:
-                try:
-                    # Delete all permissions - this invalidates the token on Meta's servers
-                    url = f"{self.base_url}/{fb_user_id}/permissions"
-
-                    logger.info(f"Calling Meta API to revoke token for user: {fb_user_id}")
-                    response = requests.delete(
-                        url,
-                        params={"access_token": access_token},
-                        timeout=10
-                    )
-
-                    response.raise_for_status()
-
-                    # Check response
-                    data = response.json()
-                    if data.get("success"):
-                        logger.info(f"✅ Successfully revoked token on Meta API for user: {fb_user_id}")
-                    else:
-                        logger.warning(f"Meta API revocation returned unexpected response: {data}")
-
-                except requests.exceptions.HTTPError as e:
-                    logger.error(f"Meta API revocation failed with HTTP error: {e}")
-                    # Continue to mark as revoked locally anyway for safety
-                except Exception as e:
-                    logger.error(f"Failed to revoke token on Meta API: {e}")
-                    # Continue to mark as revoked locally anyway for safety
+                # Continue to mark as revoked locally even if this fails, for safety
+                self.revoke_on_meta(fb_user_id, access_token)
             else:
                 logger.info(f"Skipping Meta API call (token already revoked by Facebook webhook)")
 
@@ -642,6 +898,7 @@ class FacebookOAuthService:
             token_record.revoked = True
             token_record.updated_at = datetime.now(timezone.utc)
             db.commit()
+            self.mark_tokens_changed()
 
             logger.info(f"Marked token as revoked in database for FB user: {fb_user_id}")
             return True
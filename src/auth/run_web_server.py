@@ -10,7 +10,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from auth.web_server import app
+from auth.web_server import app, UVICORN_LOOP, UVICORN_HTTP
 from config.settings import settings
 import uvicorn
 
@@ -29,6 +29,8 @@ if __name__ == "__main__":
         app,
         host=settings.web_server_host,
         port=settings.web_server_port,
+        loop=UVICORN_LOOP,
+        http=UVICORN_HTTP,
         log_level=settings.log_level.lower()
     )
 
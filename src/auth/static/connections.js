@@ -0,0 +1,36 @@
+async function revokeConnection(fbUserId) {
+    if (!confirm('Are you sure you want to revoke access for this connection?')) {
+        return;
+    }
+
+    const messageEl = document.getElementById('message');
+    messageEl.style.display = 'block';
+    messageEl.className = '';
+    messageEl.textContent = 'Revoking access...';
+
+    try {
+        const response = await fetch('/admin/facebook/logout', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ fb_user_id: fbUserId })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            messageEl.className = 'success';
+            messageEl.textContent = '✅ Access revoked successfully! Reloading...';
+            setTimeout(() => {
+                window.location.reload();
+            }, 1500);
+        } else {
+            messageEl.className = 'error';
+            messageEl.textContent = '❌ Error: ' + (data.error || 'Failed to revoke access');
+        }
+    } catch (error) {
+        messageEl.className = 'error';
+        messageEl.textContent = '❌ Error: ' + error.message;
+    }
+}
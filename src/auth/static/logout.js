@@ -0,0 +1,31 @@
+async function confirmRevoke() {
+    const messageEl = document.getElementById('message');
+    messageEl.style.display = 'block';
+    messageEl.className = '';
+    messageEl.textContent = 'Revoking access...';
+
+    try {
+        const response = await fetch('/api/logout', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            }
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            messageEl.className = 'success';
+            messageEl.innerHTML = '✅ Access revoked successfully!<br>Redirecting to home...';
+            setTimeout(() => {
+                window.location.href = '/';
+            }, 2000);
+        } else {
+            messageEl.className = 'error';
+            messageEl.textContent = '❌ Error: ' + (data.error || 'Failed to revoke access');
+        }
+    } catch (error) {
+        messageEl.className = 'error';
+        messageEl.textContent = '❌ Error: ' + error.message;
+    }
+}
@@ -4,10 +4,18 @@ Handles secure storage and validation of Meta API access tokens.
 """
 import json
 import os
+import stat
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Any
-from datetime import datetime, timedelta
+from typing import Dict, Optional, Any, Tuple
+from urllib.parse import quote, unquote
+from datetime import datetime, timedelta, timezone
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
 
 try:
     # Try absolute imports first (when run as part of package)
@@ -23,68 +31,226 @@ except ImportError:
     from utils.logger import logger
 
 
+# Translation table for token charset checks: allowed bytes (alphanumeric,
+# hyphen, underscore) map to 0, everything else maps to 1.
+_TOKEN_CHARSET_TABLE = bytes(
+    0 if (chr(i).isascii() and chr(i).isalnum()) or chr(i) in "_-" else 1
+    for i in range(256)
+)
+
+# Every Meta access token starts with this prefix ("EAAB", "EAAI", "EAAG", ...)
+_TOKEN_PREFIX = "EAA"
+
+# How long an OAuth token read from the database is reused before re-querying
+# (stored-token changes reported through oauth_service invalidate it sooner)
+_OAUTH_TOKEN_TTL_SECONDS = 60
+
+# A stored token validated within this window (and not close to expiry) is
+# trusted without another Meta API round-trip
+_VALIDATION_FRESHNESS = timedelta(hours=1)
+_EXPIRY_SAFETY_MARGIN = timedelta(minutes=5)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored ISO timestamp, treating naive values as UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+@lru_cache(maxsize=None)
+def _get_api_client_class():
+    """Import MetaAPIClient on first use and cache the class.
+
+    The API client pulls in the HTTP stack, so it is only imported when a
+    token actually needs a live validation call.
+    """
+    try:
+        from ..api.client import MetaAPIClient
+    except ImportError:
+        from api.client import MetaAPIClient  # type: ignore
+    return MetaAPIClient
+
+
 class TokenManager:
     """
     Manages Meta API access tokens with secure storage and validation.
 
-    Tokens are stored in JSON format with metadata:
-    {
-        "default": "EAABwz...",
-        "account_123": "EAABwz...",
-        "last_validated": "2025-10-21T10:00:00Z"
-    }
+    Each account's token lives in its own JSON file so that reading or
+    updating one account never touches the others:
+
+        ~/.meta-ads-mcp/tokens/default.json
+        {
+            "token": "EAABwz...",
+            "stored_at": "2025-10-21T10:00:00+00:00",
+            "expires_at": "2025-12-20T10:00:00+00:00",
+            "last_validated": "2025-10-21T10:00:00+00:00",
+            "source": "manual"
+        }
+
+    Shared metadata is kept in ``meta.json`` next to the token directory:
+
+        {"last_validated": "2025-10-21T10:00:00Z"}
+
+    A legacy single-file ``tokens.json`` is split into per-account files on
+    first load and renamed to ``tokens.json.migrated``.
     """
 
     def __init__(self, config_path: Optional[str] = None):
         """Initialize token manager with storage path."""
         self.config_path = config_path or settings.token_storage_path
+        self._path = Path(self.config_path)
+        self._shard_dir = self._path.with_suffix("")
+        self._meta_path = self._path.with_name("meta.json")
         self._ensure_storage_directory()
-        self._tokens: Dict[str, Any] = {}
-        self._load_tokens()
+        # Per-account records loaded on demand; None marks a known-missing account
+        self._tokens: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._meta: Dict[str, Any] = {}
+        self._oauth_cache: Optional[Tuple[str, float, int]] = None
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._migrate_legacy_file()
+        self._meta = self._read_json(self._meta_path)
 
     def _ensure_storage_directory(self) -> None:
         """Ensure the token storage directory exists with proper permissions."""
-        config_dir = Path(self.config_path).parent
-        config_dir.mkdir(parents=True, exist_ok=True)
+        config_dir = self._path.parent
+        try:
+            st = os.stat(config_dir)
+        except FileNotFoundError:
+            config_dir.mkdir(parents=True, exist_ok=True)
+            st = None
 
-        # Set restrictive permissions (read/write for owner only)
+        # Set restrictive permissions (read/write for owner only), skipping
+        # the chmod when the directory already has them
         if os.name != 'nt':  # Not Windows
-            config_dir.chmod(0o700)
+            if st is None or stat.S_IMODE(st.st_mode) != 0o700:
+                config_dir.chmod(0o700)
+
+    def _ensure_shard_directory(self) -> None:
+        """Create the per-account token directory on first write."""
+        if not self._shard_dir.is_dir():
+            self._shard_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    def _account_path(self, account_id: str) -> Path:
+        """Path of the token file for an account."""
+        return self._shard_dir / f"{quote(account_id, safe='-_')}.json"
 
-    def _load_tokens(self) -> None:
-        """Load tokens from storage file."""
+    def _migrate_legacy_file(self) -> None:
+        """Split a legacy single-file token store into per-account files."""
+        if not self._path.is_file():
+            return
+
+        try:
+            legacy = self._load_json(self._path)
+        except (ValueError, IOError) as e:
+            logger.error("Failed to read legacy token file %s, leaving it in place: %s", self._path, e)
+            return
+        if not isinstance(legacy, dict):
+            logger.error("Legacy token file %s is not a JSON object, leaving it in place", self._path)
+            return
+
+        # Write every per-account file (and the metadata) before retiring the
+        # legacy file, so a failed write is retried on the next start
+        last_validated = legacy.pop("last_validated", None)
+        ok = True
         try:
-            if Path(self.config_path).exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self._tokens = json.load(f)
-            else:
-                self._tokens = {}
-        except (json.JSONDecodeError, IOError) as e:
-            logger.warning(f"Failed to load tokens: {e}")
-            self._tokens = {}
-
-    def _save_tokens(self) -> None:
-        """Save tokens to storage file."""
+            for account_id, record in legacy.items():
+                # A file left by an earlier, partial migration may since have
+                # been updated through set_token; never overwrite it
+                if self._account_path(account_id).is_file():
+                    continue
+                if isinstance(record, str):
+                    record = {"token": record}
+                if isinstance(record, dict):
+                    self._tokens[account_id] = record
+                    ok = self._save_record(account_id) and ok
+            if last_validated:
+                self._meta["last_validated"] = last_validated
+                ok = self._save_meta() and ok
+        except OSError as e:
+            logger.error("Failed to create per-account token files: %s", e)
+            ok = False
+        if not ok:
+            logger.error("Token migration incomplete, keeping legacy token file %s", self._path)
+            return
+
+        self._path.rename(self._path.with_name(f"{self._path.name}.migrated"))
+        logger.info("Migrated %d stored token(s) to per-account files", len(legacy))
+
+    def _load_json(self, path: Path) -> Any:
+        """Read JSON from disk; {} if the file is missing or empty, raising on bad data."""
         try:
-            # Create backup before saving
-            if Path(self.config_path).exists():
-                backup_path = f"{self.config_path}.backup"
-                Path(self.config_path).rename(backup_path)
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return {}
+
+        if not data:
+            return {}
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def _read_json(self, path: Path) -> Dict[str, Any]:
+        """Read a JSON object from disk, returning {} if missing or unreadable."""
+        try:
+            return self._load_json(path)
+        except (ValueError, IOError) as e:
+            logger.warning("Failed to load tokens from %s: %s", path, e)
+            return {}
 
-            # Write new tokens file
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self._tokens, f, indent=2)
+    def _write_json(self, path: Path, data: Dict[str, Any]) -> bool:
+        """Atomically replace a JSON file with restrictive permissions.
 
-            # Set restrictive permissions
-            if os.name != 'nt':  # Not Windows
-                Path(self.config_path).chmod(0o600)
+        Returns:
+            True if the file was written
+        """
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(data, indent=2).encode('utf-8')
 
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        try:
+            # Create the file with restrictive permissions (owner read/write only)
+            # so no separate chmod is needed after writing
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            return True
         except IOError as e:
-            logger.error(f"Failed to save tokens: {e}")
-            # Restore backup if it exists
-            backup_path = f"{self.config_path}.backup"
-            if Path(backup_path).exists():
-                Path(backup_path).rename(self.config_path)
+            logger.error("Failed to save tokens to %s: %s", path, e)
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+
+    def _get_record(self, account_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored record for an account, reading its file on first use."""
+        try:
+            return self._tokens[account_id]
+        except KeyError:
+            pass
+
+        record = self._read_json(self._account_path(account_id)) or None
+        self._tokens[account_id] = record
+        return record
+
+    def _save_record(self, account_id: str) -> bool:
+        """Write a single account's token file, returning True on success."""
+        self._ensure_shard_directory()
+        return self._write_json(self._account_path(account_id), self._tokens[account_id])
+
+    def _save_meta(self) -> bool:
+        """Write shared token metadata, returning True on success."""
+        return self._write_json(self._meta_path, self._meta)
 
     def get_token(self, account_id: Optional[str] = None) -> Optional[str]:
         """
@@ -99,45 +265,75 @@ class TokenManager:
         if not account_id:
             account_id = "default"
 
-        token = self._tokens.get(account_id)
-        if token and isinstance(token, dict):
-            return token.get("token")
+        # Resolved file-backed tokens (and known-missing accounts) are cached
+        # until the next set_token/delete_token
+        try:
+            return self._resolved[account_id]
+        except KeyError:
+            pass
 
-        if token:
-            return token
+        record = self._get_record(account_id)
+        if record and record.get("token"):
+            self._resolved[account_id] = record["token"]
+            return record["token"]
 
-        # Fall back to OAuth-managed token stored in the database
-        if account_id == "default":
-            try:
-                # Lazy import to avoid circular dependencies at module import time
-                from .oauth_service import oauth_service  # type: ignore
-            except ImportError:  # pragma: no cover - fallback when running as script
-                from auth.oauth_service import oauth_service  # type: ignore
+        if account_id != "default":
+            self._resolved[account_id] = None
+            return None
 
-            try:
-                oauth_token = oauth_service.get_token()
-                if oauth_token:
-                    logger.debug("Using OAuth-managed token from database")
-                    return oauth_token
-            except Exception as exc:
-                logger.debug(f"OAuth token lookup failed: {exc}")
+        # Fall back to OAuth-managed token stored in the database
+        oauth_token = self.get_oauth_token()
+        if oauth_token:
+            return oauth_token
 
         # Fall back to environment variable for default account
-        if account_id == "default":
-            env_token = os.getenv("META_ACCESS_TOKEN")
-            if env_token:
-                logger.debug("Using META_ACCESS_TOKEN from environment variable")
-                return env_token
+        env_token = os.getenv("META_ACCESS_TOKEN")
+        if env_token:
+            logger.debug("Using META_ACCESS_TOKEN from environment variable")
+            return env_token
 
         return None
 
-    def set_token(self, token: str, account_id: Optional[str] = None) -> None:
+    def get_oauth_token(self) -> Optional[str]:
+        """
+        Get the most recent active OAuth-managed token from the database.
+
+        Found tokens are cached until the TTL passes or oauth_service reports
+        that stored tokens changed.
+
+        Returns:
+            Access token string or None if there is no usable OAuth token
+        """
+        try:
+            # Lazy import to avoid circular dependencies at module import time
+            from .oauth_service import oauth_service  # type: ignore
+        except ImportError:  # pragma: no cover - fallback when running as script
+            from auth.oauth_service import oauth_service  # type: ignore
+
+        version = oauth_service.token_version
+        cached = self._oauth_cache
+        if cached and cached[2] == version and time.monotonic() - cached[1] < _OAUTH_TOKEN_TTL_SECONDS:
+            return cached[0]
+
+        try:
+            oauth_token = oauth_service.get_token()
+        except Exception as exc:
+            logger.debug("OAuth token lookup failed: %s", exc)
+            return None
+        if oauth_token:
+            logger.debug("Using OAuth-managed token from database")
+            self._oauth_cache = (oauth_token, time.monotonic(), version)
+        return oauth_token
+
+    def set_token(self, token: str, account_id: Optional[str] = None,
+                  expires_at: Optional[datetime] = None) -> None:
         """
         Store access token for account.
 
         Args:
             token: Meta API access token
             account_id: Account ID or None for default
+            expires_at: Token expiry time, if known
         """
         if not account_id:
             account_id = "default"
@@ -146,18 +342,24 @@ class TokenManager:
         if not self._validate_token_format(token):
             raise ValueError("Invalid token format")
 
+        now_iso = datetime.now(timezone.utc).isoformat()
+
         # Store token with metadata
         self._tokens[account_id] = {
             "token": token,
-            "stored_at": datetime.utcnow().isoformat(),
+            "stored_at": now_iso,
+            "expires_at": expires_at.isoformat() if expires_at else None,
             "source": "manual"  # Could be 'oauth', 'manual', etc.
         }
+        self._save_record(account_id)
 
         # Update last validated timestamp
-        self._tokens["last_validated"] = datetime.utcnow().isoformat()
+        self._meta["last_validated"] = now_iso
+        self._save_meta()
 
-        self._save_tokens()
-        logger.info(f"Token stored for account: {account_id}")
+        self._resolved.clear()
+        self.invalidate_oauth_cache()
+        logger.info("Token stored for account: %s", account_id)
 
     def validate_token(self, token: Optional[str] = None, account_id: Optional[str] = None) -> bool:
         """
@@ -170,6 +372,16 @@ class TokenManager:
         Returns:
             True if token is valid
         """
+        record_id = account_id or "default"
+        record = self._get_record(record_id)
+        if record is not None and token and token != record.get("token"):
+            record = None
+
+        # Skip the network round-trip if the stored token was validated recently
+        if record and self._is_locally_fresh(record):
+            logger.debug("Token validated recently, skipping Meta API check")
+            return True
+
         if not token:
             token = self.get_token(account_id)
 
@@ -179,23 +391,39 @@ class TokenManager:
 
         try:
             # Basic validation - try to make a simple API call
-            from ..api.client import MetaAPIClient
-            client = MetaAPIClient(token)
+            client = _get_api_client_class()(token)
 
             # Try to get user info (simple validation)
             user = client.get_user_info()
             if user:
                 # Update validation timestamp
-                self._tokens["last_validated"] = datetime.utcnow().isoformat()
-                self._save_tokens()
+                validated_at = datetime.now(timezone.utc).isoformat()
+                self._meta["last_validated"] = validated_at
+                self._save_meta()
+                if record is not None:
+                    record["last_validated"] = validated_at
+                    self._save_record(record_id)
                 logger.info("Token validation successful")
                 return True
 
         except Exception as e:
-            logger.error(f"Token validation failed: {e}")
+            logger.error("Token validation failed: %s", e)
 
         return False
 
+    def _is_locally_fresh(self, record: Dict[str, Any]) -> bool:
+        """Check whether a stored token record can be trusted without re-validation."""
+        last_validated = _parse_timestamp(record.get("last_validated"))
+        if last_validated is None:
+            return False
+
+        now = datetime.now(timezone.utc)
+        if now - last_validated > _VALIDATION_FRESHNESS:
+            return False
+
+        expires_at = _parse_timestamp(record.get("expires_at"))
+        return expires_at is None or now < expires_at - _EXPIRY_SAFETY_MARGIN
+
     def refresh_token(self, token: str) -> Optional[str]:
         """
         Refresh an expired token (placeholder for future implementation).
@@ -223,25 +451,38 @@ class TokenManager:
         if not account_id:
             account_id = "default"
 
-        if account_id in self._tokens:
-            del self._tokens[account_id]
-            self._save_tokens()
-            logger.info(f"Token deleted for account: {account_id}")
+        if self._get_record(account_id) is not None:
+            self._tokens[account_id] = None
+            try:
+                self._account_path(account_id).unlink()
+            except FileNotFoundError:
+                pass
+            self._resolved.clear()
+            self.invalidate_oauth_cache()
+            logger.info("Token deleted for account: %s", account_id)
             return True
 
         return False
 
+    def invalidate_oauth_cache(self) -> None:
+        """Drop the cached OAuth token so the next lookup re-reads the database."""
+        self._oauth_cache = None
+
     def list_accounts(self) -> Dict[str, Any]:
         """List all stored account tokens with metadata."""
-        accounts = {}
-        for key, value in self._tokens.items():
-            if key != "last_validated" and isinstance(value, dict):
-                accounts[key] = {
-                    "stored_at": value.get("stored_at"),
-                    "source": value.get("source"),
-                    "has_token": bool(value.get("token"))
-                }
-        return accounts
+        if self._shard_dir.is_dir():
+            for entry in self._shard_dir.glob("*.json"):
+                self._get_record(unquote(entry.stem))
+
+        return {
+            key: {
+                "stored_at": value.get("stored_at"),
+                "source": value.get("source"),
+                "has_token": bool(value.get("token"))
+            }
+            for key, value in self._tokens.items()
+            if value
+        }
 
     def _validate_token_format(self, token: str) -> bool:
         """
@@ -256,16 +497,21 @@ class TokenManager:
         if not token or not isinstance(token, str):
             return False
 
-        # Meta access tokens typically start with "EAAB" or "EAAI" and are quite long
-        if len(token) < 50:
+        # Cheap prefix rejection before any encoding or charset work
+        if not token.startswith(_TOKEN_PREFIX):
             return False
 
-        # Should contain only valid characters (alphanumeric, hyphens, underscores)
-        import re
-        if not re.match(r'^[A-Za-z0-9_-]+$', token):
+        try:
+            raw = token.encode("ascii")
+        except UnicodeEncodeError:
             return False
 
-        return True
+        # Meta access tokens typically start with "EAAB" or "EAAI" and are quite long
+        if len(raw) < 50:
+            return False
+
+        # Should contain only valid characters (alphanumeric, hyphens, underscores)
+        return b"\x01" not in raw.translate(_TOKEN_CHARSET_TABLE)
 
     def get_token_info(self, account_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -280,7 +526,7 @@ class TokenManager:
         if not account_id:
             account_id = "default"
 
-        token_data = self._tokens.get(account_id)
+        token_data = self._get_record(account_id)
         if not token_data:
             return {"exists": False}
 
@@ -288,7 +534,7 @@ class TokenManager:
             "exists": True,
             "stored_at": token_data.get("stored_at"),
             "source": token_data.get("source"),
-            "last_validated": self._tokens.get("last_validated")
+            "last_validated": self._meta.get("last_validated")
         }
 
 
@@ -1,11 +1,13 @@
 """
 Background worker for refreshing Facebook OAuth tokens.
-Uses APScheduler to run periodic token refresh jobs.
+Runs the token refresh job periodically on a daemon thread.
 """
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+from typing import Optional
+from sqlalchemy import func, update
 
 try:
     from ..config.settings import settings
@@ -22,77 +24,162 @@ except ImportError:
     from auth.oauth_service import oauth_service
 
 
+# Seconds between refresh runs
+REFRESH_INTERVAL_SECONDS = 3600
+
+# Active (non-revoked, unexpired) token count seen by the last run, and
+# whether a token has been stored since then. Lets idle deployments skip
+# opening a DB session entirely.
+_last_active_count: Optional[int] = None
+_active_tokens_dirty = True
+
+# Tokens saved by another process (e.g. the MCP server writing the same DB)
+# never mark this process dirty, so only this many runs in a row are skipped
+# before the database is checked again
+MAX_SKIPPED_RUNS = 6
+_skipped_runs = 0
+
+
+def mark_active_tokens_dirty():
+    """Flag that a token was stored so the next refresh run queries the DB."""
+    global _active_tokens_dirty
+    _active_tokens_dirty = True
+
+
 class TokenRefreshWorker:
     """Worker for refreshing OAuth tokens before expiry."""
     
     def __init__(self):
-        self.scheduler = BackgroundScheduler()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
         self.is_running = False
     
     def refresh_tokens_job(self):
         """Job to refresh tokens that are expiring soon."""
+        global _last_active_count, _active_tokens_dirty, _skipped_runs
+        
         if not settings.is_oauth_configured:
             logger.debug("OAuth not configured, skipping token refresh")
             return
         
+        if not _active_tokens_dirty and _last_active_count == 0 and _skipped_runs < MAX_SKIPPED_RUNS:
+            _skipped_runs += 1
+            logger.debug("No active tokens since last run, skipping token refresh")
+            return
+        _skipped_runs = 0
+        
         logger.info("Starting token refresh job")
         
         db = get_db_session()
         try:
             # Calculate refresh window
-            refresh_window = datetime.now(timezone.utc) + timedelta(days=settings.token_refresh_window_days)
+            now = datetime.now(timezone.utc)
+            refresh_window = now + timedelta(days=settings.token_refresh_window_days)
             
-            # Find tokens that need refresh
-            tokens_to_refresh = db.query(FacebookToken).filter(
+            # Find tokens that need refresh. Only plain column values are handed
+            # to the worker threads; the Session stays on this thread.
+            tokens_to_refresh = db.query(
+                FacebookToken.id, FacebookToken.fb_user_id, FacebookToken.encrypted_access_token
+            ).filter(
                 FacebookToken.revoked == False,
                 FacebookToken.expires_at < refresh_window,
-                FacebookToken.expires_at > datetime.now(timezone.utc)  # Not already expired
+                FacebookToken.expires_at > now  # Not already expired
             ).all()
-            
-            logger.info(f"Found {len(tokens_to_refresh)} tokens to refresh")
+            logger.info("Found %d tokens to refresh", len(tokens_to_refresh))
             
             success_count = 0
             failure_count = 0
+            failed_ids = []
+            refreshed = []
             
-            for token_record in tokens_to_refresh:
-                try:
-                    success = oauth_service.refresh_token(token_record)
-                    if success:
-                        success_count += 1
-                    else:
-                        failure_count += 1
-                        # Mark as revoked if refresh failed
-                        token_record.revoked = True
-                        db.commit()
-                        logger.warning(f"Token refresh failed, marked as revoked: {token_record.fb_user_id}")
-                except Exception as e:
-                    failure_count += 1
-                    logger.error(f"Error refreshing token {token_record.fb_user_id}: {e}")
-                    # Mark as revoked on error
+            # Each refresh is an independent Graph API round-trip, so run them in parallel
+            with ThreadPoolExecutor(max_workers=max(1, settings.token_refresh_concurrency)) as executor:
+                futures = {
+                    executor.submit(oauth_service.refresh_token, row.encrypted_access_token): row
+                    for row in tokens_to_refresh
+                }
+                
+                for future in as_completed(futures):
+                    row = futures[future]
                     try:
-                        token_record.revoked = True
-                        db.commit()
-                    except:
-                        db.rollback()
+                        result = future.result()
+                        if result:
+                            success_count += 1
+                            encrypted_token, expires_at = result
+                            refreshed.append({
+                                "id": row.id,
+                                "encrypted_access_token": encrypted_token,
+                                "expires_at": expires_at,
+                                "last_refreshed": datetime.now(timezone.utc),
+                            })
+                            logger.info("Refreshed token for FB user: %s", row.fb_user_id)
+                        else:
+                            failure_count += 1
+                            # Mark as revoked if refresh failed
+                            failed_ids.append(row.id)
+                            logger.warning("Token refresh failed, marked as revoked: %s", row.fb_user_id)
+                    except Exception as e:
+                        failure_count += 1
+                        logger.error("Error refreshing token %s: %s", row.fb_user_id, e)
+                        # Mark as revoked on error
+                        failed_ids.append(row.id)
+            
+            # Persist refreshed tokens and revoke failures in a single transaction
+            try:
+                if refreshed:
+                    # ORM bulk UPDATE by primary key
+                    db.execute(update(FacebookToken), refreshed)
+                if failed_ids:
+                    db.execute(
+                        update(FacebookToken)
+                        .where(FacebookToken.id.in_(failed_ids))
+                        .values(revoked=True)
+                        .execution_options(synchronize_session=False)
+                    )
+                db.commit()
+                if failed_ids or success_count:
+                    oauth_service.mark_tokens_changed()
+            except Exception as e:
+                db.rollback()
+                logger.error("Failed to persist token refresh results: %s", e)
             
             logger.info(
-                f"Token refresh completed: {success_count} succeeded, {failure_count} failed"
+                "Token refresh completed: %d succeeded, %d failed",
+                success_count, failure_count
             )
             
-            # Alert if failure rate is high
+            # Remember whether any active tokens remain for the next run
             total = len(tokens_to_refresh)
+            active_count = total - failure_count
+            if active_count == 0:
+                active_count = db.query(func.count(FacebookToken.id)).filter(
+                    FacebookToken.revoked == False,
+                    FacebookToken.expires_at > now
+                ).scalar()
+            _last_active_count = active_count
+            _active_tokens_dirty = False
+            
+            # Alert if failure rate is high
             if total > 0 and (failure_count / total) > 0.1:  # >10% failure rate
                 logger.warning(
-                    f"High token refresh failure rate: {failure_count}/{total} "
-                    f"({(failure_count/total)*100:.1f}%)"
+                    "High token refresh failure rate: %d/%d (%.1f%%)",
+                    failure_count, total, (failure_count / total) * 100
                 )
         except Exception as e:
-            logger.error(f"Token refresh job error: {e}")
+            logger.error("Token refresh job error: %s", e)
         finally:
             db.close()
     
+    def _run(self):
+        """Run the refresh job every interval until stopped."""
+        while not self._stop.wait(REFRESH_INTERVAL_SECONDS):
+            try:
+                self.refresh_tokens_job()
+            except Exception as e:
+                logger.error("Token refresh job crashed: %s", e)
+    
     def start(self):
-        """Start the scheduler."""
+        """Start the background refresh thread."""
         if self.is_running:
             logger.warning("Token refresh worker already running")
             return
@@ -100,24 +187,25 @@ class TokenRefreshWorker:
         init_database()
         
         # Schedule job to run every hour
-        self.scheduler.add_job(
-            self.refresh_tokens_job,
-            trigger=IntervalTrigger(hours=1),
-            id="token_refresh",
-            name="Refresh Facebook OAuth tokens",
-            replace_existing=True
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="token-refresh-worker",
+            daemon=True
         )
-        
-        self.scheduler.start()
+        self._thread.start()
         self.is_running = True
         logger.info("Token refresh worker started (runs every hour)")
     
     def stop(self):
-        """Stop the scheduler."""
+        """Stop the background refresh thread."""
         if not self.is_running:
             return
         
-        self.scheduler.shutdown()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
         self.is_running = False
         logger.info("Token refresh worker stopped")
 
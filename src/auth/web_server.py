@@ -2,23 +2,40 @@
 FastAPI web server for OAuth endpoints, webhooks, and admin routes.
 This runs separately from the MCP server to handle HTTP requests.
 """
-import html
+import asyncio
+import base64
+import gzip
+import hashlib
+import hmac
+import importlib.util
+import json
+import string
+import weakref
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, NamedTuple, Tuple
+from urllib.parse import urlencode
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query, Request, Depends
-from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse, FileResponse
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse, Response, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
-import requests
 from pydantic import BaseModel
 from fastapi import Body
+from sqlalchemy import Row, bindparam, case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import escape
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
 
 try:
     from ..config.settings import settings
-    from ..utils.logger import logger
-    from .database import init_database, get_db_session, FacebookToken, OAuthState
+    from ..utils.logger import logger, enable_queue_logging, disable_queue_logging
+    from .database import init_database, init_async_database, warm_async_pool, get_async_db, FacebookToken, OAuthState
     from .oauth_service import oauth_service
     from .web_server_token_endpoint import router as token_router
     from ..auth.token_manager import token_manager
@@ -27,13 +44,167 @@ except ImportError:
     import os
     sys.path.insert(0, os.path.dirname(__file__))
     from config.settings import settings
-    from utils.logger import logger
-    from auth.database import init_database, get_db_session, FacebookToken, OAuthState
+    from utils.logger import logger, enable_queue_logging, disable_queue_logging
+    from auth.database import init_database, init_async_database, warm_async_pool, get_async_db, FacebookToken, OAuthState
     from auth.oauth_service import oauth_service
     from auth.web_server_token_endpoint import router as token_router
     from auth.token_manager import token_manager
 
 
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    class FastJSONResponse(JSONResponse):
+        """JSONResponse rendered with orjson."""
+
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+else:
+    _json_loads = json.loads
+    FastJSONResponse = JSONResponse
+
+
+# Methods a preflight may ask for (everything the app routes)
+_CORS_METHODS = frozenset({"DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"})
+
+
+class FastCORS:
+    """
+    Pure ASGI CORS middleware for credentialed requests with any method and header.
+
+    Preflights are answered directly with precomputed headers; other requests
+    only get their response start message rewritten. Keep custom middleware in
+    this form rather than BaseHTTPMiddleware, which wraps every response body.
+
+    Args:
+        app: ASGI application to wrap
+        allow: Allowed origins; "*" allows any origin
+    """
+
+    def __init__(self, app, allow: List[str]):
+        self.app = app
+        self.allow_all = "*" in allow
+        self.allow = frozenset(origin.encode("latin-1") for origin in allow)
+        self.preflight_headers = [
+            (b"vary", b"Origin, Access-Control-Request-Method, Access-Control-Request-Headers"),
+            (b"access-control-allow-methods", ", ".join(sorted(_CORS_METHODS)).encode("latin-1")),
+            (b"access-control-max-age", b"600"),
+            (b"access-control-allow-credentials", b"true"),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        allowed = origin is not None and (self.allow_all or origin in self.allow)
+
+        if origin is not None and request_method is not None and scope["method"] == "OPTIONS":
+            await self._preflight(send, origin, allowed, request_method, request_headers)
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                vary = [b"Origin"]
+                headers = []
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"vary":
+                        vary.insert(-1, value)
+                    else:
+                        headers.append((name, value))
+                headers.append((b"vary", b", ".join(vary)))
+                if origin is not None:
+                    headers.append((b"access-control-allow-credentials", b"true"))
+                    if allowed:
+                        headers.append((b"access-control-allow-origin", origin))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(self, send, origin, allowed, request_method, request_headers):
+        headers = list(self.preflight_headers)
+        if allowed:
+            headers.append((b"access-control-allow-origin", origin))
+        if request_headers is not None:
+            headers.append((b"access-control-allow-headers", request_headers))
+
+        failures = []
+        if not allowed:
+            failures.append("origin")
+        if request_method.decode("latin-1") not in _CORS_METHODS:
+            failures.append("method")
+
+        if failures:
+            body = ("Disallowed CORS " + ", ".join(failures)).encode("utf-8")
+            headers.append((b"content-type", b"text/plain; charset=utf-8"))
+            headers.append((b"content-length", str(len(body)).encode("latin-1")))
+            await send({"type": "http.response.start", "status": 400, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        await send({"type": "http.response.start", "status": 204, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+
+# Statements built once at import; SQLAlchemy reuses their compiled SQL from its
+# cache and asyncpg reuses the server-side prepared statement per connection
+# One active connection, picked inside the UPDATE that refreshes its accounts
+_ACTIVE_TOKEN_ID_BY_FB = (
+    select(FacebookToken.id)
+    .where(FacebookToken.revoked.is_(False), FacebookToken.fb_user_id == bindparam("fb"))
+    .limit(1)
+    .scalar_subquery()
+)
+_ACTIVE_TOKEN_ID_BY_USER = (
+    select(FacebookToken.id)
+    .where(FacebookToken.revoked.is_(False), FacebookToken.user_id == bindparam("user"))
+    .limit(1)
+    .scalar_subquery()
+)
+# Existence probe for /logout: no need to load any token rows
+_STMT_HAS_ACTIVE_TOKENS = select(select(FacebookToken.id).where(FacebookToken.revoked.is_(False)).exists())
+# Only the columns the success page renders, skipping ORM hydration of the row
+_STMT_LATEST_ACTIVE_ACCOUNTS = (
+    select(FacebookToken.accounts, FacebookToken.updated_at, FacebookToken.fb_user_id)
+    .where(FacebookToken.revoked.is_(False))
+    .order_by(FacebookToken.updated_at.desc())
+    .limit(1)
+)
+# Connections page: newest first, one page at a time, with totals counted in SQL.
+# Only the columns the cards show are selected (no token blobs, no ORM entities).
+_STMT_ALL_TOKENS = select(
+    FacebookToken.id,
+    FacebookToken.fb_user_id,
+    FacebookToken.created_at,
+    FacebookToken.expires_at,
+    FacebookToken.revoked,
+    FacebookToken.accounts,
+).order_by(FacebookToken.created_at.desc())
+_STMT_TOKENS_BY_USER = _STMT_ALL_TOKENS.where(FacebookToken.user_id == bindparam("user"))
+# (total, active) in a single aggregate pass
+_STMT_COUNT_TOKENS = select(
+    func.count(),
+    func.coalesce(func.sum(case((FacebookToken.revoked.is_(False), 1), else_=0)), 0),
+).select_from(FacebookToken)
+_STMT_COUNT_TOKENS_BY_USER = _STMT_COUNT_TOKENS.where(FacebookToken.user_id == bindparam("user"))
+
+# Connection cards rendered per page of /admin/facebook/connections
+CONNECTIONS_PAGE_SIZE = 50
+CONNECTIONS_MAX_PAGE_SIZE = 200
+# Pages with at least this many cards are streamed to the browser while rendering
+CONNECTIONS_STREAM_MIN_ROWS = 100
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -41,7 +212,13 @@ async def lifespan(app: FastAPI):
     Replaces deprecated @app.on_event("startup") and @app.on_event("shutdown").
     """
     # Startup
+    enable_queue_logging()
     init_database()
+    init_async_database()
+    try:
+        await warm_async_pool()
+    except Exception as e:
+        logger.warning(f"Failed to warm database pool: {e}")
 
     # Start token refresh worker
     try:
@@ -51,11 +228,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Failed to start token refresh worker: {e}")
 
+    # Open the shared Graph API session so logins reuse its keep-alive pool
+    await oauth_service.open_session()
+
     logger.info("OAuth web server started")
 
     yield
 
     # Shutdown
+    await oauth_service.close_session()
+
     try:
         from .token_refresh_worker import stop_refresh_worker
         stop_refresh_worker()
@@ -63,41 +245,203 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error stopping token refresh worker: {e}")
 
+    disable_queue_logging()
+
+
+# uvloop and httptools ship with uvicorn[standard]; fall back to the pure-Python
+# loop and parser where they can't be installed (e.g. uvloop on Windows).
+# Run a single worker: page caches and token_version are per process.
+UVICORN_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+UVICORN_HTTP = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
 
 # Initialize FastAPI app with lifespan
 app = FastAPI(
     title="Meta Ads MCP OAuth Server",
     description="OAuth endpoints for Facebook Login integration",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware (adjust for production)
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"] if not settings.is_production else [],  # Configure properly in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    FastCORS,
+    allow=["*"] if not settings.is_production else [],  # Configure properly in production
 )
 
+# Compress HTML and JSON responses (pre-compressed static pages pass through untouched)
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
 # Include token processing router (implicit flow callback handler)
-app.include_router(token_router)
+app.include_router(token_router, default_response_class=FastJSONResponse)
+
+
+# Browser cache lifetime for the static HTML pages and assets (seconds)
+_STATIC_PAGE_MAX_AGE = 3600
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers reuse assets without revalidating for a while."""
 
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", f"public, max-age={_STATIC_PAGE_MAX_AGE}")
+        return response
 
-# Mount static files (if static directory exists)
+
+# Mount static files (if static directory exists); the logout and connections
+# pages link their CSS/JS from here instead of inlining it in every response
 static_path = Path(__file__).parent / "static"
 if static_path.exists():
-    app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
+    app.mount("/static", CachedStaticFiles(directory=str(static_path)), name="static")
 
 
-@app.get("/")
-async def root():
-    """Root endpoint - show login page."""
-    login_page = static_path / "login.html"
-    if login_page.exists():
-        return FileResponse(login_page)
-    return HTMLResponse("""
+def _body_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.md5(body).hexdigest() + '"'
+
+
+def _revalidated_response(request: Request, body: bytes, etag: str) -> Response:
+    """Serve an HTML body that browsers must revalidate, answering 304 when unchanged."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(body, headers=headers)
+
+
+# HTML templates are compiled once; auto_reload is off so renders never stat the files
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+_templates = Environment(
+    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+    auto_reload=False,
+    autoescape=select_autoescape(["html"]),
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_CONNECTIONS_TEMPLATE = _templates.get_template("connections.html")
+
+
+def _format_timestamp(value: Optional[datetime]) -> str:
+    """Format a token timestamp as 'YYYY-MM-DD HH:MM:SS' (or 'N/A')."""
+    if value is None:
+        return "N/A"
+    # isoformat skips strftime's format parser; drop tzinfo so no offset is appended
+    return value.replace(tzinfo=None).isoformat(" ", "seconds")
+
+
+def _connection_row(token: Row) -> Dict[str, Any]:
+    """Pre-format one connection so the card template only substitutes strings."""
+    accounts = token.accounts or []
+    return {
+        "short_id": token.id[:8],
+        "fb_user_id": token.fb_user_id,
+        "created": _format_timestamp(token.created_at),
+        "expires": _format_timestamp(token.expires_at),
+        "revoked": token.revoked,
+        "accounts": accounts,
+        "n_accounts": len(accounts),
+    }
+
+# The logout pages have no dynamic parts, so they are rendered to bytes once
+_LOGOUT_CONFIRM_HTML: bytes = _templates.get_template("logout.html").render().encode("utf-8")
+_LOGOUT_NO_CONNECTIONS_HTML: bytes = (
+    _templates.get_template("logout_no_connections.html").render().encode("utf-8")
+)
+_LOGOUT_CONFIRM_ETAG = _body_etag(_LOGOUT_CONFIRM_HTML)
+_LOGOUT_NO_CONNECTIONS_ETAG = _body_etag(_LOGOUT_NO_CONNECTIONS_HTML)
+
+
+class _StaticPage(NamedTuple):
+    """A static HTML page held in memory with its response headers prebuilt."""
+    body: bytes
+    gzipped: bytes
+    etag: str
+    gzip_etag: str
+    headers: Dict[str, str]
+    gzip_headers: Dict[str, str]
+
+
+def _load_static_page(name: str) -> Optional[_StaticPage]:
+    """
+    Read a static HTML page and prepare everything needed to serve it.
+
+    Returns:
+        The loaded page, or None if the file is missing
+    """
+    page = static_path / name
+    try:
+        st = page.stat()
+        body = page.read_bytes()
+    except FileNotFoundError:
+        return None
+    digest = hashlib.md5(f"{st.st_mtime_ns}-{st.st_size}".encode()).hexdigest()
+    # Each content-coding is a different representation, so each gets its own strong tag
+    etag = f'"{digest}"'
+    gzip_etag = f'"{digest}-gzip"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={_STATIC_PAGE_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    return _StaticPage(
+        body=body,
+        gzipped=gzip.compress(body, compresslevel=9),
+        etag=etag,
+        gzip_etag=gzip_etag,
+        headers=headers,
+        gzip_headers={**headers, "ETag": gzip_etag, "Content-Encoding": "gzip"},
+    )
+
+
+# The pages can't change while the process runs, so they are resolved once at import
+_STATIC_PAGES: Dict[str, Optional[_StaticPage]] = {
+    name: _load_static_page(name) for name in ("login.html", "callback.html")
+}
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q=0 refusals."""
+    wildcard = False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "*"):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        # An explicit gzip entry overrides the wildcard
+        if coding == "gzip":
+            return q > 0
+        wildcard = q > 0
+    return wildcard
+
+
+def _static_page_response(request: Request, name: str) -> Optional[Response]:
+    """Serve a preloaded static page, answering 304 when the browser copy is current."""
+    page = _STATIC_PAGES[name]
+    if page is None:
+        return None
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if page.gzip_etag in if_none_match:
+        headers = {k: v for k, v in page.gzip_headers.items() if k != "Content-Encoding"}
+        return Response(status_code=304, headers=headers)
+    if page.etag in if_none_match:
+        return Response(status_code=304, headers=page.headers)
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return HTMLResponse(page.gzipped, headers=page.gzip_headers)
+    return HTMLResponse(page.body, headers=page.headers)
+
+
+# Fallback landing page used when static/login.html is missing
+_ROOT_FALLBACK_HTML = """
     <html>
         <head><title>Meta Ads MCP OAuth</title></head>
         <body style="font-family: Arial; text-align: center; padding: 50px;">
@@ -167,104 +511,29 @@ async def root():
             </script>
         </body>
     </html>
-    """)
+    """
+
+
+@app.get("/")
+async def root(request: Request):
+    """Root endpoint - show login page."""
+    response = _static_page_response(request, "login.html")
+    if response is not None:
+        return response
+    return HTMLResponse(_ROOT_FALLBACK_HTML)
 
 
 @app.get("/login")
-async def login_page():
+async def login_page(request: Request):
     """Login page endpoint."""
-    login_page = static_path / "login.html"
-    if login_page.exists():
-        return FileResponse(login_page)
+    response = _static_page_response(request, "login.html")
+    if response is not None:
+        return response
     return RedirectResponse(url="/")
 
 
-@app.get("/auth/facebook/success")
-async def auth_success():
-    """Display success page after authentication."""
-    # Get the most recent active (non-revoked) connection
-    db = get_db_session()
-    accounts_html = ""
-    try:
-        # Get the most recently updated active token (not revoked)
-        latest_token = db.query(FacebookToken).filter(
-            FacebookToken.revoked == False
-        ).order_by(
-            FacebookToken.updated_at.desc()
-        ).first()
-
-        if latest_token:
-            logger.info(f"Loading accounts for token {latest_token.fb_user_id} (updated: {latest_token.updated_at})")
-            logger.info(f"Accounts field type: {type(latest_token.accounts)}")
-            logger.info(f"Accounts data: {latest_token.accounts}")
-
-            if latest_token.accounts:
-                import json
-                # Handle both string JSON and direct list
-                if isinstance(latest_token.accounts, str):
-                    try:
-                        accounts = json.loads(latest_token.accounts)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse accounts JSON: {e}")
-                        accounts = []
-                elif isinstance(latest_token.accounts, list):
-                    accounts = latest_token.accounts
-                else:
-                    logger.error(f"Unexpected accounts type: {type(latest_token.accounts)}")
-                    accounts = []
-
-                logger.info(f"Parsed {len(accounts)} accounts")
-
-                if accounts:
-                    # Calculate summary statistics
-                    total_count = len(accounts)
-
-                    # Build accounts HTML with limit for performance
-                    accounts_html = f"""
-                    <div style='background: #e0e7ff; padding: 12px; border-radius: 8px; margin: 15px 0;'>
-                        <strong style='color: #4338ca;'>✓ {total_count} ad accounts connected</strong>
-                    </div>
-                    """
-
-                    # Show first 10 accounts only for performance
-                    display_limit = 10
-                    accounts_html += "<div style='margin-top: 15px; max-height: 400px; overflow-y: auto; border: 1px solid #e5e7eb; border-radius: 8px; padding: 10px;'>"
-
-                    for i, account in enumerate(accounts[:display_limit]):
-                        account_name = html.escape(str(account.get('name', 'Unknown')))
-                        account_id = html.escape(str(account.get('id', 'N/A')))
-                        account_status = str(account.get('account_status', account.get('status', 'Unknown')))
-                        accounts_html += f"""
-                        <div style='background: #f9fafb; padding: 12px; margin: 8px 0; border-radius: 6px; border-left: 3px solid #667eea;'>
-                            <div style='font-weight: 600; color: #1f2937;'>{account_name}</div>
-                            <div style='font-size: 12px; color: #6b7280; margin-top: 4px;'>ID: {account_id} • Status: {account_status}</div>
-                        </div>
-                        """
-
-                    accounts_html += "</div>"
-
-                    # Show "and X more" message if there are more accounts
-                    if total_count > display_limit:
-                        remaining = total_count - display_limit
-                        accounts_html += f"""
-                        <p style='color: #6b7280; font-size: 14px; margin-top: 10px; text-align: center;'>
-                            ... and {remaining} more account{'s' if remaining > 1 else ''}
-                        </p>
-                        <p style='color: #4b5563; font-size: 13px; margin-top: 8px; text-align: center;'>
-                            View all accounts in <a href='/admin/facebook/connections' style='color: #667eea; text-decoration: underline;'>Connections page</a>
-                        </p>
-                        """
-            else:
-                logger.warning("No accounts data found in token record")
-        else:
-            logger.warning("No token record found")
-    except Exception as e:
-        logger.error(f"Error loading accounts: {e}", exc_info=True)
-    finally:
-        db.close()
-    
-    return HTMLResponse(
-        content=f"""
+# Success page shell; only the accounts fragment changes per request
+_SUCCESS_TEMPLATE = string.Template("""
         <!DOCTYPE html>
         <html>
         <head>
@@ -272,8 +541,8 @@ async def auth_success():
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>Success - Connected!</title>
             <style>
-                * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-                body {{
+                * { margin: 0; padding: 0; box-sizing: border-box; }
+                body {
                     font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
                     background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                     min-height: 100vh;
@@ -281,8 +550,8 @@ async def auth_success():
                     align-items: center;
                     justify-content: center;
                     padding: 20px;
-                }}
-                .container {{
+                }
+                .container {
                     background: white;
                     border-radius: 20px;
                     box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
@@ -290,8 +559,8 @@ async def auth_success():
                     max-width: 500px;
                     width: 100%;
                     text-align: center;
-                }}
-                .success-icon {{
+                }
+                .success-icon {
                     width: 80px;
                     height: 80px;
                     background: #4caf50;
@@ -302,10 +571,10 @@ async def auth_success():
                     justify-content: center;
                     font-size: 40px;
                     color: white;
-                }}
-                h1 {{ color: #333; margin-bottom: 10px; }}
-                .subtitle {{ color: #666; margin-bottom: 30px; }}
-                .button {{
+                }
+                h1 { color: #333; margin-bottom: 10px; }
+                .subtitle { color: #666; margin-bottom: 30px; }
+                .button {
                     display: inline-block;
                     padding: 12px 24px;
                     background: #667eea;
@@ -315,8 +584,8 @@ async def auth_success():
                     margin: 10px;
                     font-weight: 600;
                     transition: all 0.3s ease;
-                }}
-                .button:hover {{ background: #5568d3; transform: translateY(-2px); }}
+                }
+                .button:hover { background: #5568d3; transform: translateY(-2px); }
             </style>
         </head>
         <body>
@@ -326,7 +595,7 @@ async def auth_success():
                 <p class="subtitle">Your Facebook account has been connected to Meta Ads MCP</p>
                 
                 <h2 style="color: #333; margin-top: 30px; margin-bottom: 15px; font-size: 18px;">Connected Ad Accounts:</h2>
-                {accounts_html if accounts_html else "<p style='color: #999;'>No ad accounts found. Make sure your account has access to ad accounts.</p>"}
+                $accounts_html
                 
                 <div style="margin-top: 30px;">
                     <a href="/admin/facebook/connections" class="button">View All Connections</a>
@@ -336,7 +605,185 @@ async def auth_success():
             </div>
         </body>
         </html>
-        """
+        """)
+
+_NO_ACCOUNTS_HTML = "<p style='color: #999;'>No ad accounts found. Make sure your account has access to ad accounts.</p>"
+
+
+# Rendered pages keyed by name and filter -> (token_version, body, ETag). Entries
+# are only served while no token has been saved, revoked or refreshed since.
+_page_cache: Dict[str, Tuple[int, bytes, str]] = {}
+_PAGE_CACHE_MAX_ENTRIES = 256
+
+
+def _cached_page_response(request: Request, key: str) -> Optional[Response]:
+    """Return the cached page for key (or a 304) if it is still current."""
+    cached = _page_cache.get(key)
+    if cached is None or cached[0] != oauth_service.token_version:
+        return None
+
+    _, body, etag = cached
+    return _revalidated_response(request, body, etag)
+
+
+def _store_page(key: str, version: int, body: bytes) -> str:
+    """Store a rendered page in the page cache and return its ETag."""
+    etag = _body_etag(body)
+    if len(_page_cache) >= _PAGE_CACHE_MAX_ENTRIES:
+        _page_cache.clear()
+    _page_cache[key] = (version, body, etag)
+    return etag
+
+
+def _cache_page(key: str, version: int, content: str) -> HTMLResponse:
+    """Cache a freshly rendered page and return it with its ETag."""
+    body = content.encode("utf-8")
+    etag = _store_page(key, version, body)
+    return HTMLResponse(body, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+# Rendered text is flushed to the client in pieces of roughly this many characters
+_STREAM_CHUNK_CHARS = 16 * 1024
+
+
+def _stream_and_cache_page(key: str, version: int, chunks: Iterator[str]) -> StreamingResponse:
+    """
+    Stream a page to the client as it renders, caching the full body once done.
+
+    The ETag isn't known until the last chunk, so this response has none; the
+    next request for the page is served from the cache with one.
+    """
+    def body() -> Iterator[bytes]:
+        sent: List[bytes] = []
+        pending: List[str] = []
+        size = 0
+        for chunk in chunks:
+            pending.append(chunk)
+            size += len(chunk)
+            if size >= _STREAM_CHUNK_CHARS:
+                data = "".join(pending).encode("utf-8")
+                sent.append(data)
+                yield data
+                pending.clear()
+                size = 0
+        data = "".join(pending).encode("utf-8")
+        sent.append(data)
+        yield data
+        _store_page(key, version, b"".join(sent))
+
+    # A sync iterator is run in Starlette's threadpool, keeping rendering off the loop
+    return StreamingResponse(
+        body(), media_type="text/html; charset=utf-8", headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def _load_latest_accounts(db: AsyncSession) -> Optional[List[Dict[str, Any]]]:
+    """
+    Load the parsed ad accounts of the most recently updated active connection.
+
+    Returns:
+        List of accounts, or None if there is no active connection
+    """
+    # Get the most recently updated active token (not revoked)
+    row = (await db.execute(_STMT_LATEST_ACTIVE_ACCOUNTS)).first()
+
+    if not row:
+        logger.warning("No token record found")
+        return None
+
+    accounts, updated_at, fb_user_id = row
+    logger.info(f"Loading accounts for token {fb_user_id} (updated: {updated_at})")
+    # Lazy %-args: the accounts payload can be large and is only formatted at DEBUG
+    logger.debug("Accounts field type: %s", type(accounts))
+    logger.debug("Accounts data: %s", accounts)
+
+    if not accounts:
+        logger.warning("No accounts data found in token record")
+        return []
+
+    # The JSON column hands back a list; only legacy rows hold an encoded string
+    if isinstance(accounts, list):
+        pass
+    elif isinstance(accounts, str):
+        try:
+            accounts = _json_loads(accounts)
+        except ValueError as e:
+            logger.error(f"Failed to parse accounts JSON: {e}")
+            accounts = []
+    else:
+        logger.error(f"Unexpected accounts type: {type(accounts)}")
+        accounts = []
+
+    logger.info(f"Parsed {len(accounts)} accounts")
+    return accounts
+
+
+@app.get("/auth/facebook/success")
+async def auth_success(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Display success page after authentication."""
+    cached = _cached_page_response(request, "success")
+    if cached is not None:
+        return cached
+    version = oauth_service.token_version
+
+    # Get the most recent active (non-revoked) connection
+    accounts_html = ""
+    try:
+        accounts = await _load_latest_accounts(db)
+
+        if accounts:
+            # Calculate summary statistics
+            total_count = len(accounts)
+
+            # Build accounts HTML with limit for performance; fragments are
+            # collected and joined once instead of growing a string
+            parts = [f"""
+            <div style='background: #e0e7ff; padding: 12px; border-radius: 8px; margin: 15px 0;'>
+                <strong style='color: #4338ca;'>✓ {total_count} ad accounts connected</strong>
+            </div>
+            """]
+
+            # Show first 10 accounts only for performance
+            display_limit = 10
+            parts.append("<div style='margin-top: 15px; max-height: 400px; overflow-y: auto; border: 1px solid #e5e7eb; border-radius: 8px; padding: 10px;'>")
+
+            for i, account in enumerate(accounts[:display_limit]):
+                account_name = escape(account.get('name', 'Unknown'))
+                account_id = escape(account.get('id', 'N/A'))
+                account_status = escape(account.get('account_status', account.get('status', 'Unknown')))
+                parts.append(f"""
+                <div style='background: #f9fafb; padding: 12px; margin: 8px 0; border-radius: 6px; border-left: 3px solid #667eea;'>
+                    <div style='font-weight: 600; color: #1f2937;'>{account_name}</div>
+                    <div style='font-size: 12px; color: #6b7280; margin-top: 4px;'>ID: {account_id} • Status: {account_status}</div>
+                </div>
+                """)
+
+            parts.append("</div>")
+
+            # Show "and X more" message if there are more accounts
+            if total_count > display_limit:
+                remaining = total_count - display_limit
+                parts.append(f"""
+                <p style='color: #6b7280; font-size: 14px; margin-top: 10px; text-align: center;'>
+                    ... and {remaining} more account{'s' if remaining > 1 else ''}
+                </p>
+                <p style='color: #4b5563; font-size: 13px; margin-top: 8px; text-align: center;'>
+                    View all accounts in <a href='/admin/facebook/connections' style='color: #667eea; text-decoration: underline;'>Connections page</a>
+                </p>
+                """)
+
+            accounts_html = "".join(parts)
+    except Exception as e:
+        logger.error(f"Error loading accounts: {e}", exc_info=True)
+        # Don't cache a page rendered from a failed lookup
+        return HTMLResponse(
+            content=_SUCCESS_TEMPLATE.substitute(accounts_html=_NO_ACCOUNTS_HTML)
+        )
+    
+    return _cache_page(
+        "success",
+        version,
+        _SUCCESS_TEMPLATE.substitute(accounts_html=accounts_html or _NO_ACCOUNTS_HTML)
     )
 
 
@@ -356,7 +803,7 @@ async def auth_facebook(user_id: Optional[str] = Query(None)):
     
     try:
         # Generate state token
-        state = oauth_service.generate_state(user_id=user_id)
+        state = await asyncio.to_thread(oauth_service.generate_state, user_id=user_id)
         
         # Get authorization URL
         auth_url = oauth_service.get_authorization_url(state)
@@ -368,32 +815,9 @@ async def auth_facebook(user_id: Optional[str] = Query(None)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/auth/facebook/callback")
-async def auth_facebook_callback(
-    request: Request,
-    code: Optional[str] = Query(None),
-    state: Optional[str] = Query(None),
-    error: Optional[str] = Query(None),
-    error_reason: Optional[str] = Query(None)
-):
-    """
-    Handle Facebook OAuth callback.
-    
-    For implicit flow (response_type=token), serve callback.html which uses JavaScript
-    to extract the token from the URL fragment and POST it to /auth/facebook/callback/token.
-    
-    For authorization code flow (response_type=code), process the code directly.
-    """
-    # If there's a fragment (implicit flow), serve the callback page
-    # The JavaScript will extract the token and POST it to /callback/token
-    if '#' in str(request.url) or not code:
-        # Serve callback.html which handles fragment extraction client-side
-        callback_page = static_path / "callback.html"
-        if callback_page.exists():
-            return FileResponse(callback_page)
-        else:
-            # Fallback: redirect to success page
-            return HTMLResponse("""
+# OAuth callback pages, built once at import time
+# Served when static/callback.html is missing
+_CALLBACK_FALLBACK_RESPONSE = HTMLResponse("""
             <html>
                 <head><title>Processing...</title></head>
                 <body>
@@ -426,30 +850,23 @@ async def auth_facebook_callback(
                     </script>
                 </body>
             </html>
-            """)
-    
-    # Continue with authorization code flow (original implementation)
-    if error:
-        error_msg = f"OAuth error: {error}"
-        if error_reason:
-            error_msg += f" ({error_reason})"
-        logger.warning(error_msg)
-        return HTMLResponse(
-            content=f"""
+""")
+
+_OAUTH_FAILED_PAGE = (
+    b"""
             <html>
                 <body>
                     <h1>Authentication Failed</h1>
-                    <p>{html.escape(error_msg)}</p>
+                    <p>""",
+    b"""</p>
                     <p><a href="/auth/facebook">Try again</a></p>
                 </body>
             </html>
             """,
-            status_code=400
-        )
-    
-    if not code or not state:
-        return HTMLResponse(
-            content="""
+)
+
+_INVALID_REQUEST_RESPONSE = HTMLResponse(
+    content="""
             <!DOCTYPE html>
             <html>
             <head>
@@ -467,15 +884,11 @@ async def auth_facebook_callback(
             </body>
             </html>
             """,
-            status_code=400
-        )
-    
-    try:
-        # Validate state
-        user_id = oauth_service.validate_state(state)
-        if user_id is None:
-            return HTMLResponse(
-                content="""
+    status_code=400
+)
+
+_SESSION_EXPIRED_RESPONSE = HTMLResponse(
+    content="""
                 <!DOCTYPE html>
                 <html>
                 <head>
@@ -493,34 +906,115 @@ async def auth_facebook_callback(
                 </body>
                 </html>
                 """,
-                status_code=400
-            )
+    status_code=400
+)
+
+_AUTH_ERROR_PAGE = (
+    b"""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <meta charset="UTF-8">
+                <title>Authentication Error</title>
+                <style>
+                    body { font-family: Arial; text-align: center; padding: 50px; }
+                    .error { color: #c33; background: #fee; padding: 15px; border-radius: 5px; margin: 20px 0; }
+                    .button { display: inline-block; padding: 10px 20px; background: #1877f2; color: white; text-decoration: none; border-radius: 5px; margin: 10px; }
+                </style>
+            </head>
+            <body>
+                <h1>Authentication Error</h1>
+                <div class="error">""",
+    b"""</div>
+                <a href="/auth/facebook" class="button">Try Again</a>
+                <a href="/" class="button" style="background: #667eea;">Back to Home</a>
+            </body>
+            </html>
+            """,
+)
+
+
+def _error_page(page: Tuple[bytes, bytes], message: str, status_code: int) -> HTMLResponse:
+    """Render a prebuilt (prefix, suffix) error page around an escaped message."""
+    prefix, suffix = page
+    return HTMLResponse(prefix + str(escape(message)).encode() + suffix, status_code=status_code)
+
+
+@app.get("/auth/facebook/callback")
+async def auth_facebook_callback(
+    request: Request,
+    code: Optional[str] = Query(None),
+    state: Optional[str] = Query(None),
+    error: Optional[str] = Query(None),
+    error_reason: Optional[str] = Query(None)
+):
+    """
+    Handle Facebook OAuth callback.
+    
+    For implicit flow (response_type=token), serve callback.html which uses JavaScript
+    to extract the token from the URL fragment and POST it to /auth/facebook/callback/token.
+    
+    For authorization code flow (response_type=code), process the code directly.
+    """
+    # If there's a fragment (implicit flow), serve the callback page
+    # The JavaScript will extract the token and POST it to /callback/token
+    if '#' in str(request.url) or not code:
+        # Serve callback.html which handles fragment extraction client-side
+        response = _static_page_response(request, "callback.html")
+        if response is not None:
+            return response
+        else:
+            # Fallback: redirect to success page
+            return _CALLBACK_FALLBACK_RESPONSE
+    
+    # Continue with authorization code flow (original implementation)
+    if error:
+        error_msg = f"OAuth error: {error}"
+        if error_reason:
+            error_msg += f" ({error_reason})"
+        logger.warning(error_msg)
+        return _error_page(_OAUTH_FAILED_PAGE, error_msg, status_code=400)
+    
+    if not code or not state:
+        return _INVALID_REQUEST_RESPONSE
+    
+    try:
+        # Validate state
+        user_id = await asyncio.to_thread(oauth_service.validate_state, state)
+        if user_id is None:
+            return _SESSION_EXPIRED_RESPONSE
         
         # Exchange code for short token
-        short_token_response = oauth_service.exchange_code_for_token(code)
+        short_token_response = await oauth_service.exchange_code_for_token_async(code)
         short_token = short_token_response.get("access_token")
         
         # Exchange short token for long token
-        long_token_response = oauth_service.exchange_short_token_for_long(short_token)
+        long_token_response = await oauth_service.exchange_short_token_for_long_async(short_token)
         long_token = long_token_response.get("access_token")
         expires_in = long_token_response.get("expires_in", 5184000)
         
-        # Get user info
-        user_info = oauth_service.get_user_info(long_token)
+        # Get user info and ad accounts concurrently
+        user_info, accounts = await asyncio.gather(
+            oauth_service.get_user_info_async(long_token),
+            oauth_service.get_ad_accounts_async(long_token),
+            return_exceptions=True
+        )
+        if isinstance(user_info, BaseException):
+            raise user_info
         fb_user_id = user_info.get("id")
         
-        # Get ad accounts (may fail if token doesn't have ads_read permission)
-        accounts = []
-        try:
-            accounts = oauth_service.get_ad_accounts(long_token)
-        except Exception as e:
-            logger.warning(f"Could not fetch ad accounts (may need ads_read permission): {e}")
+        # Ad accounts may fail if token doesn't have ads_read permission
+        if isinstance(accounts, BaseException):
+            logger.warning(f"Could not fetch ad accounts (may need ads_read permission): {accounts}")
             # Continue without accounts - token is still valid for basic operations
+            accounts = []
         
         # Save token
-        # Parse permissions from requested scopes
-        permissions = settings.fb_oauth_scopes.split(",") if settings.fb_oauth_scopes else []
-        oauth_service.save_token(
+        # Permissions are the requested scopes, pre-split in settings
+        permissions = settings.fb_oauth_scopes_list
+        # DB write (and token encryption) runs off the event loop
+        await asyncio.to_thread(
+            oauth_service.save_token,
             user_id=user_id,
             fb_user_id=fb_user_id,
             access_token=long_token,
@@ -529,50 +1023,34 @@ async def auth_facebook_callback(
             accounts=accounts
         )
         
-        # Success page with nice styling
-        accounts_html = ""
-        if accounts:
-            accounts_html = "<div style='margin-top: 20px;'>"
-            for account in accounts:
-                account_name = html.escape(account.get('name', 'Unknown'))
-                account_id = html.escape(account.get('id', 'N/A'))
-                account_status = account.get('status', 'Unknown')
-                accounts_html += f"""
-                <div style='background: #f0f4f8; padding: 15px; margin: 10px 0; border-radius: 8px; border-left: 4px solid #667eea;'>
-                    <strong>{account_name}</strong><br>
-                    <small>ID: {account_id}</small><br>
-                    <small>Status: {account_status}</small>
-                </div>
-                """
-            accounts_html += "</div>"
-        
         # Redirect to success page
         return RedirectResponse(url="/auth/facebook/success")
     except Exception as e:
         logger.error(f"OAuth callback error: {e}")
-        return HTMLResponse(
-            content=f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>Authentication Error</title>
-                <style>
-                    body {{ font-family: Arial; text-align: center; padding: 50px; }}
-                    .error {{ color: #c33; background: #fee; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-                    .button {{ display: inline-block; padding: 10px 20px; background: #1877f2; color: white; text-decoration: none; border-radius: 5px; margin: 10px; }}
-                </style>
-            </head>
-            <body>
-                <h1>Authentication Error</h1>
-                <div class="error">{html.escape(str(e))}</div>
-                <a href="/auth/facebook" class="button">Try Again</a>
-                <a href="/" class="button" style="background: #667eea;">Back to Home</a>
-            </body>
-            </html>
-            """,
-            status_code=500
-        )
+        return _error_page(_AUTH_ERROR_PAGE, str(e), status_code=500)
+
+
+# App secret used to verify signed_request HMACs, encoded once
+_APP_SECRET_BYTES = settings.fb_app_secret.encode() if settings.fb_app_secret else None
+
+# Fixed JSON bodies, serialized once
+_STATUS_OK_BODY = b'{"status":"ok"}'
+_SUCCESS_BODY = b'{"success":true}'
+
+# signed_request values already verified and handled; Facebook retries deliveries
+# with the same payload, which can then be acknowledged without another HMAC
+_handled_deauth_requests: Dict[str, None] = {}
+_HANDLED_DEAUTH_MAX_ENTRIES = 256
+
+
+def _json_bytes_response(body: bytes) -> Response:
+    """Wrap a pre-serialized JSON body in a response."""
+    return Response(content=body, media_type="application/json")
+
+
+def _b64url_decode(data: str) -> bytes:
+    """Decode unpadded base64url, as used by Facebook's signed_request."""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
 
 
 @app.post("/webhooks/facebook/deauth")
@@ -587,48 +1065,32 @@ async def webhook_deauth(request: Request):
         
         if not signed_request:
             raise HTTPException(status_code=400, detail="Missing signed_request")
+
+        if signed_request in _handled_deauth_requests:
+            return _json_bytes_response(_STATUS_OK_BODY)
         
         # Decode and verify signed_request
         # Format: <signature>.<payload> (both base64url encoded)
-        import base64
-        import hmac
-        import hashlib
-        import json
+        if _APP_SECRET_BYTES is None:
+            raise RuntimeError("FB_APP_SECRET is not configured")
         
         parts = signed_request.split(".")
         if len(parts) != 2:
             raise HTTPException(status_code=400, detail="Invalid signed_request format")
-        
-        # Decode payload
-        payload_encoded = parts[1]
-        # Add padding if needed
-        padding = len(payload_encoded) % 4
-        if padding:
-            payload_encoded += '=' * (4 - padding)
+        sig_encoded, payload_encoded = parts
         
         try:
-            payload_data = base64.urlsafe_b64decode(payload_encoded)
-            payload = json.loads(payload_data)
+            payload = _json_loads(_b64url_decode(payload_encoded))
         except Exception as e:
             logger.error(f"Failed to decode signed_request payload: {e}")
             raise HTTPException(status_code=400, detail="Invalid payload encoding")
         
         # Verify signature
         # Facebook uses HMAC-SHA256 with app_secret as key and payload as message
-        expected_sig = hmac.new(
-            settings.fb_app_secret.encode(),
-            parts[1].encode(),
-            hashlib.sha256
-        ).digest()
-        
-        # Decode actual signature
-        sig_encoded = parts[0]
-        padding = len(sig_encoded) % 4
-        if padding:
-            sig_encoded += '=' * (4 - padding)
+        expected_sig = hmac.new(_APP_SECRET_BYTES, payload_encoded.encode(), hashlib.sha256).digest()
         
         try:
-            actual_sig = base64.urlsafe_b64decode(sig_encoded)
+            actual_sig = _b64url_decode(sig_encoded)
         except Exception as e:
             logger.error(f"Failed to decode signature: {e}")
             raise HTTPException(status_code=400, detail="Invalid signature encoding")
@@ -641,19 +1103,23 @@ async def webhook_deauth(request: Request):
         user_id = payload.get("user_id")
         if not user_id:
             logger.warning("Deauth webhook missing user_id")
-            return JSONResponse({"status": "ok"})  # Still return 200
+            return _json_bytes_response(_STATUS_OK_BODY)  # Still return 200
 
         # Revoke token (Facebook has already revoked it on their side, just update our DB)
         oauth_service.revoke_token(str(user_id), call_meta_api=False)
         logger.info(f"Revoked token for FB user: {user_id}")
+
+        if len(_handled_deauth_requests) >= _HANDLED_DEAUTH_MAX_ENTRIES:
+            _handled_deauth_requests.clear()
+        _handled_deauth_requests[signed_request] = None
         
-        return JSONResponse({"status": "ok"})
+        return _json_bytes_response(_STATUS_OK_BODY)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Deauth webhook error: {e}")
         # Still return 200 to prevent FB retries
-        return JSONResponse({"status": "error", "message": str(e)})
+        return FastJSONResponse({"status": "error", "message": str(e)})
 
 
 class ManualTokenRequest(BaseModel):
@@ -666,8 +1132,9 @@ async def set_manual_token(payload: ManualTokenRequest):
     try:
         if not payload.token or len(payload.token) < 50:
             raise HTTPException(status_code=400, detail="Invalid token")
-        token_manager.set_token(payload.token, account_id="default")
-        return JSONResponse({"success": True})
+        # Token file write runs off the event loop
+        await asyncio.to_thread(token_manager.set_token, payload.token, account_id="default")
+        return _json_bytes_response(_SUCCESS_BODY)
     except HTTPException:
         raise
     except Exception as e:
@@ -680,73 +1147,117 @@ class LogoutRequest(BaseModel):
     fb_user_id: Optional[str] = None
 
 
-@app.post("/admin/facebook/logout")
-async def admin_logout(payload: LogoutRequest):
-    """
-    Revoke stored token(s) for the specified user_id or fb_user_id.
+# Per-user locks so a burst of revoke requests for the same user runs one at a
+# time: the first does the work, the rest find nothing left to revoke. Entries
+# drop out on their own once no request is holding them.
+_revoke_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
 
-    SECURITY: This properly revokes tokens on Meta's servers via DELETE /permissions,
-    not just in the local database. This ensures tokens become truly invalid.
+
+def _revoke_lock(key: str) -> asyncio.Lock:
+    """Return the lock that serializes revokes for key, creating it on first use."""
+    lock = _revoke_locks.get(key)
+    if lock is None:
+        lock = _revoke_locks[key] = asyncio.Lock()
+    return lock
+
+
+async def _revoke_active_tokens(db: AsyncSession, lock_key: str, *criteria) -> Optional[Tuple[int, int]]:
     """
-    db = get_db_session()
-    try:
-        if not payload.user_id and not payload.fb_user_id:
-            raise HTTPException(status_code=400, detail="Provide user_id or fb_user_id")
+    Revoke matching active tokens on Meta, then mark them revoked in one UPDATE.
 
-        query = db.query(FacebookToken).filter(FacebookToken.revoked == False)
-        if payload.fb_user_id:
-            query = query.filter(FacebookToken.fb_user_id == payload.fb_user_id)
-        elif payload.user_id:
-            query = query.filter(FacebookToken.user_id == payload.user_id)
+    Args:
+        db: Async database session
+        lock_key: Identifies the tokens being revoked; concurrent calls with the
+            same key are run one after another
+        *criteria: Extra WHERE clauses narrowing the active tokens to revoke
 
-        tokens = query.all()
+    Returns:
+        Tuple of (revoked, failed) counts, or None if no active token matched
+    """
+    async with _revoke_lock(lock_key):
+        tokens = (await db.execute(
+            select(FacebookToken.id, FacebookToken.fb_user_id, FacebookToken.encrypted_access_token)
+            .where(FacebookToken.revoked.is_(False), *criteria)
+        )).all()
         if not tokens:
-            return JSONResponse({"success": True, "revoked": 0})
+            return None
 
-        # Revoke each token properly (calls Meta API + updates DB)
-        revoked = 0
+        # Actually invalidate each token on Meta's servers
         failed = 0
 
         for token in tokens:
             try:
-                success = oauth_service.revoke_token(
-                    fb_user_id=token.fb_user_id,
-                    call_meta_api=True  # Actually invalidate on Meta's servers
-                )
-                if success:
-                    revoked += 1
-                else:
-                    failed += 1
+                access_token = oauth_service.encryption.decrypt(token.encrypted_access_token)
             except Exception as e:
+                # Still marked as revoked locally below to be safe
                 failed += 1
-                logger.error(f"Error revoking token: {e}")
+                logger.error(f"Failed to decrypt token for revocation: {e}")
+                continue
+            await oauth_service.revoke_on_meta_async(token.fb_user_id, access_token)
+
+        # Mark them all revoked locally in a single UPDATE
+        result = await db.execute(
+            update(FacebookToken)
+            .where(FacebookToken.id.in_([token.id for token in tokens]))
+            .values(revoked=True, updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        oauth_service.mark_tokens_changed()
+        return result.rowcount - failed, failed
+
 
-        # Don't need db.commit() - revoke_token() already commits
+@app.post("/admin/facebook/logout")
+async def admin_logout(payload: LogoutRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Revoke stored token(s) for the specified user_id or fb_user_id.
+
+    SECURITY: This properly revokes tokens on Meta's servers via DELETE /permissions,
+    not just in the local database. This ensures tokens become truly invalid.
+    """
+    try:
+        if not payload.user_id and not payload.fb_user_id:
+            raise HTTPException(status_code=400, detail="Provide user_id or fb_user_id")
+
+        if payload.fb_user_id:
+            outcome = await _revoke_active_tokens(
+                db, f"fb:{payload.fb_user_id}", FacebookToken.fb_user_id == payload.fb_user_id
+            )
+        else:
+            outcome = await _revoke_active_tokens(
+                db, f"user:{payload.user_id}", FacebookToken.user_id == payload.user_id
+            )
+
+        if outcome is None:
+            return FastJSONResponse({"success": True, "revoked": 0})
+        revoked, failed = outcome
 
         logger.info(f"Revoked {revoked} token(s) for logout request (failed: {failed})")
-        return JSONResponse({"success": True, "revoked": revoked, "failed": failed})
+        return FastJSONResponse({"success": True, "revoked": revoked, "failed": failed})
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Logout failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
 
 
 @app.post("/admin/facebook/refresh-accounts")
-async def admin_refresh_accounts(user_id: Optional[str] = Query(None), fb_user_id: Optional[str] = Query(None)):
+async def admin_refresh_accounts(
+    user_id: Optional[str] = Query(None),
+    fb_user_id: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Refetch ad accounts using the stored OAuth token and update DB."""
     if not user_id and not fb_user_id:
         raise HTTPException(status_code=400, detail="Provide user_id or fb_user_id")
 
-    # Resolve access token
+    # Resolve access token (sync DB query plus decrypt, so off the event loop)
     access_token = None
     try:
         if fb_user_id:
-            access_token = oauth_service.get_token(fb_user_id=fb_user_id)
+            access_token = await asyncio.to_thread(oauth_service.get_token, fb_user_id=fb_user_id)
         elif user_id:
-            access_token = oauth_service.get_token(user_id=user_id)
+            access_token = await asyncio.to_thread(oauth_service.get_token, user_id=user_id)
     except Exception as e:
         logger.error(f"Token lookup failed: {e}")
 
@@ -754,25 +1265,30 @@ async def admin_refresh_accounts(user_id: Optional[str] = Query(None), fb_user_i
         raise HTTPException(status_code=404, detail="No active token found for specified user")
 
     # Fetch accounts from Meta and update DB record
-    db = get_db_session()
     try:
-        accounts = oauth_service.get_ad_accounts(access_token) or []
+        accounts = await oauth_service.get_ad_accounts_async(access_token) or []
 
-        query = db.query(FacebookToken).filter(FacebookToken.revoked == False)
+        # Select and update the record in one round-trip
         if fb_user_id:
-            query = query.filter(FacebookToken.fb_user_id == fb_user_id)
-        elif user_id:
-            query = query.filter(FacebookToken.user_id == user_id)
-
-        token_record = query.first()
-        if not token_record:
+            target, params = _ACTIVE_TOKEN_ID_BY_FB, {"fb": fb_user_id}
+        else:
+            target, params = _ACTIVE_TOKEN_ID_BY_USER, {"user": user_id}
+
+        result = await db.execute(
+            update(FacebookToken)
+            .where(FacebookToken.id == target)
+            .values(accounts=accounts, updated_at=datetime.now(timezone.utc))
+            .returning(FacebookToken.id)
+            .execution_options(synchronize_session=False),
+            params
+        )
+        if result.first() is None:
             raise HTTPException(status_code=404, detail="Token record not found")
 
-        token_record.accounts = accounts
-        token_record.updated_at = datetime.now(timezone.utc)
-        db.commit()
+        await db.commit()
+        oauth_service.mark_tokens_changed()
 
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "accounts_count": len(accounts),
             "accounts": accounts
@@ -780,196 +1296,77 @@ async def admin_refresh_accounts(user_id: Optional[str] = Query(None), fb_user_i
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to refresh accounts: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
 
 
 @app.get("/admin/facebook/connections")
-async def admin_connections(user_id: Optional[str] = Query(None)):
+async def admin_connections(
+    request: Request,
+    user_id: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(CONNECTIONS_PAGE_SIZE, ge=1, le=CONNECTIONS_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     List Facebook connection status with revoke capability.
     
     Query params:
         user_id: Optional filter by app user ID
+        page: 1-based page number
+        page_size: Connections per page
     """
-    db = get_db_session()
+    cache_key = f"connections:{user_id or ''}:{page}:{page_size}"
+    cached = _cached_page_response(request, cache_key)
+    if cached is not None:
+        return cached
+    version = oauth_service.token_version
+
     try:
-        query = db.query(FacebookToken)
         if user_id:
-            query = query.filter(FacebookToken.user_id == user_id)
-        
-        tokens = query.all()
-        
-        # Build HTML response
-        connections_html = ""
-        active_count = 0
-        
-        for token in tokens:
-            status_color = "#10b981" if not token.revoked else "#ef4444"
-            status_text = "Active" if not token.revoked else "Revoked"
-            
-            if not token.revoked:
-                active_count += 1
-            
-            accounts_list = ""
-            if token.accounts:
-                for acc in token.accounts:
-                    accounts_list += f"<li>{acc.get('name', 'Unknown')} ({acc.get('id', 'N/A')})</li>"
-            
-            revoke_button = ""
-            if not token.revoked:
-                revoke_button = f"""
-                <button onclick="revokeConnection('{token.fb_user_id}')" 
-                        style="background:#dc2626; color:white; border:none; padding:8px 16px; border-radius:6px; cursor:pointer; font-size:12px; margin-top:10px;">
-                    Revoke Access
-                </button>
-                """
-            
-            connections_html += f"""
-            <div style="background:#f9fafb; border:1px solid #e5e7eb; border-radius:8px; padding:20px; margin:15px 0;">
-                <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:15px;">
-                    <h3 style="margin:0; color:#111827;">Connection #{token.id[:8]}</h3>
-                    <span style="background:{status_color}; color:white; padding:4px 12px; border-radius:12px; font-size:12px; font-weight:600;">
-                        {status_text}
-                    </span>
-                </div>
-                <div style="color:#6b7280; font-size:14px;">
-                    <p><strong>FB User ID:</strong> {token.fb_user_id}</p>
-                    <p><strong>Created:</strong> {token.created_at.strftime('%Y-%m-%d %H:%M:%S') if token.created_at else 'N/A'}</p>
-                    <p><strong>Expires:</strong> {token.expires_at.strftime('%Y-%m-%d %H:%M:%S') if token.expires_at else 'N/A'}</p>
-                    <p><strong>Ad Accounts:</strong> {len(token.accounts) if token.accounts else 0}</p>
-                    {f"<ul style='margin:10px 0; padding-left:20px;'>{accounts_list}</ul>" if accounts_list else ""}
-                </div>
-                {revoke_button}
-            </div>
-            """
-        
-        return HTMLResponse(f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>Facebook Connections</title>
-                <style>
-                    * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-                    body {{
-                        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                        background: #f3f4f6;
-                        min-height: 100vh;
-                        padding: 40px 20px;
-                    }}
-                    .container {{
-                        max-width: 800px;
-                        margin: 0 auto;
-                        background: white;
-                        border-radius: 12px;
-                        padding: 40px;
-                        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                    }}
-                    h1 {{ color: #111827; margin-bottom: 10px; }}
-                    .stats {{
-                        background: #dbeafe;
-                        padding: 15px;
-                        border-radius: 8px;
-                        margin: 20px 0;
-                        color: #1e40af;
-                    }}
-                    .button {{
-                        display: inline-block;
-                        padding: 10px 20px;
-                        background: #667eea;
-                        color: white;
-                        text-decoration: none;
-                        border-radius: 8px;
-                        margin: 10px 5px 10px 0;
-                        font-weight: 600;
-                        transition: all 0.2s;
-                    }}
-                    .button:hover {{ background: #5568d3; }}
-                    .button-danger {{ background: #dc2626; }}
-                    .button-danger:hover {{ background: #b91c1c; }}
-                    #message {{
-                        padding: 15px;
-                        border-radius: 8px;
-                        margin: 20px 0;
-                        display: none;
-                    }}
-                    .success {{ background: #d1fae5; color: #065f46; }}
-                    .error {{ background: #fee2e2; color: #991b1b; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h1>Facebook Connections</h1>
-                    <div class="stats">
-                        <strong>📊 Total Connections:</strong> {len(tokens)} | 
-                        <strong>✅ Active:</strong> {active_count} | 
-                        <strong>❌ Revoked:</strong> {len(tokens) - active_count}
-                    </div>
-                    
-                    <div id="message"></div>
-                    
-                    {connections_html if connections_html else "<p style='color:#6b7280; padding:20px; text-align:center;'>No connections found</p>"}
-                    
-                    <div style="margin-top:30px; padding-top:20px; border-top:1px solid #e5e7eb;">
-                        <a href="/" class="button">← Back to Home</a>
-                        <a href="/logout" class="button button-danger">Logout All</a>
-                    </div>
-                </div>
-                
-                <script>
-                    async function revokeConnection(fbUserId) {{
-                        if (!confirm('Are you sure you want to revoke access for this connection?')) {{
-                            return;
-                        }}
-                        
-                        const messageEl = document.getElementById('message');
-                        messageEl.style.display = 'block';
-                        messageEl.className = '';
-                        messageEl.textContent = 'Revoking access...';
-                        
-                        try {{
-                            const response = await fetch('/admin/facebook/logout', {{
-                                method: 'POST',
-                                headers: {{
-                                    'Content-Type': 'application/json'
-                                }},
-                                body: JSON.stringify({{ fb_user_id: fbUserId }})
-                            }});
-                            
-                            const data = await response.json();
-                            
-                            if (data.success) {{
-                                messageEl.className = 'success';
-                                messageEl.textContent = '✅ Access revoked successfully! Reloading...';
-                                setTimeout(() => {{
-                                    window.location.reload();
-                                }}, 1500);
-                            }} else {{
-                                messageEl.className = 'error';
-                                messageEl.textContent = '❌ Error: ' + (data.error || 'Failed to revoke access');
-                            }}
-                        }} catch (error) {{
-                            messageEl.className = 'error';
-                            messageEl.textContent = '❌ Error: ' + error.message;
-                        }}
-                    }}
-                </script>
-            </body>
-            </html>
-        """)
+            params = {"user": user_id}
+            list_stmt, count_stmt = _STMT_TOKENS_BY_USER, _STMT_COUNT_TOKENS_BY_USER
+        else:
+            params = {}
+            list_stmt, count_stmt = _STMT_ALL_TOKENS, _STMT_COUNT_TOKENS
+
+        total, active_count = (await db.execute(count_stmt, params)).one()
+        result = await db.execute(
+            list_stmt.limit(page_size).offset((page - 1) * page_size), params
+        )
+        rows = [_connection_row(token) for token in result]
+
+        def page_url(number: int) -> str:
+            query = {"page": number, "page_size": page_size}
+            if user_id:
+                query["user_id"] = user_id
+            return f"/admin/facebook/connections?{urlencode(query)}"
+
+        total_pages = max(1, -(-total // page_size))
+        context = dict(
+            tokens=rows,
+            total=total,
+            active_count=active_count,
+            page=page,
+            total_pages=total_pages,
+            prev_url=page_url(min(page - 1, total_pages)) if page > 1 else None,
+            next_url=page_url(page + 1) if page < total_pages else None,
+        )
+        if len(rows) >= CONNECTIONS_STREAM_MIN_ROWS:
+            return _stream_and_cache_page(cache_key, version, _CONNECTIONS_TEMPLATE.generate(**context))
+        return _cache_page(cache_key, version, _CONNECTIONS_TEMPLATE.render(**context))
     except Exception as e:
         logger.error(f"Failed to list connections: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
 
 
 @app.post("/admin/facebook/reconnect")
-async def admin_reconnect(user_id: Optional[str] = Query(None), fb_user_id: Optional[str] = Query(None)):
+async def admin_reconnect(
+    user_id: Optional[str] = Query(None),
+    fb_user_id: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Trigger re-authentication flow for a user.
     
@@ -982,288 +1379,69 @@ async def admin_reconnect(user_id: Optional[str] = Query(None), fb_user_id: Opti
     
     try:
         # Revoke existing token if found
-        db = get_db_session()
-        try:
-            query = db.query(FacebookToken)
-            if fb_user_id:
-                query = query.filter(FacebookToken.fb_user_id == fb_user_id)
-            elif user_id:
-                query = query.filter(FacebookToken.user_id == user_id)
-            
-            existing = query.first()
-            if existing:
-                existing.revoked = True
-                db.commit()
-        finally:
-            db.close()
+        stmt = select(FacebookToken.id)
+        if fb_user_id:
+            stmt = stmt.where(FacebookToken.fb_user_id == fb_user_id)
+        elif user_id:
+            stmt = stmt.where(FacebookToken.user_id == user_id)
+        
+        lock_key = f"fb:{fb_user_id}" if fb_user_id else f"user:{user_id}" if user_id else "*"
+        async with _revoke_lock(lock_key):
+            existing_id = (await db.execute(stmt.limit(1))).scalar()
+            if existing_id:
+                await db.execute(
+                    update(FacebookToken).where(FacebookToken.id == existing_id).values(revoked=True)
+                )
+                await db.commit()
+                oauth_service.mark_tokens_changed()
         
         # Generate new state and redirect
-        state = oauth_service.generate_state(user_id=user_id)
+        state = await asyncio.to_thread(oauth_service.generate_state, user_id=user_id)
         auth_url = oauth_service.get_authorization_url(state)
         
         return RedirectResponse(url=auth_url)
     except Exception as e:
+        await db.rollback()
         logger.error(f"Failed to reconnect: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/logout")
-async def logout_page():
+async def logout_page(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Display logout/revoke access page."""
     # Check if there are any active connections
-    db = get_db_session()
-    try:
-        active_tokens = db.query(FacebookToken).filter(FacebookToken.revoked == False).all()
-        has_connections = len(active_tokens) > 0
-        
-        if not has_connections:
-            return HTMLResponse(
-                content="""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="UTF-8">
-                    <title>No Active Connections</title>
-                    <style>
-                        * { margin: 0; padding: 0; box-sizing: border-box; }
-                        body {
-                            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                            min-height: 100vh;
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            padding: 20px;
-                        }
-                        .container {
-                            background: white;
-                            border-radius: 20px;
-                            box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-                            padding: 40px;
-                            max-width: 500px;
-                            width: 100%;
-                            text-align: center;
-                        }
-                        h1 { color: #333; margin-bottom: 20px; }
-                        p { color: #666; margin-bottom: 30px; }
-                        .button {
-                            display: inline-block;
-                            padding: 12px 24px;
-                            background: #667eea;
-                            color: white;
-                            text-decoration: none;
-                            border-radius: 8px;
-                            font-weight: 600;
-                            transition: all 0.3s ease;
-                        }
-                        .button:hover { background: #5568d3; transform: translateY(-2px); }
-                    </style>
-                </head>
-                <body>
-                    <div class="container">
-                        <h1>No Active Connections</h1>
-                        <p>You don't have any active Facebook connections to revoke.</p>
-                        <a href="/" class="button">Back to Home</a>
-                    </div>
-                </body>
-                </html>
-                """
-            )
-        
-        # Show logout confirmation page
-        return HTMLResponse(
-            content="""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>Logout & Revoke Access</title>
-                <style>
-                    * { margin: 0; padding: 0; box-sizing: border-box; }
-                    body {
-                        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                        min-height: 100vh;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        padding: 20px;
-                    }
-                    .container {
-                        background: white;
-                        border-radius: 20px;
-                        box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-                        padding: 40px;
-                        max-width: 500px;
-                        width: 100%;
-                        text-align: center;
-                    }
-                    .warning-icon {
-                        width: 80px;
-                        height: 80px;
-                        background: #f59e0b;
-                        border-radius: 50%;
-                        margin: 0 auto 20px;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        font-size: 40px;
-                        color: white;
-                    }
-                    h1 { color: #333; margin-bottom: 10px; }
-                    .subtitle { color: #666; margin-bottom: 30px; }
-                    .warning {
-                        background: #fef3c7;
-                        border-left: 4px solid #f59e0b;
-                        padding: 15px;
-                        margin: 20px 0;
-                        text-align: left;
-                        border-radius: 4px;
-                    }
-                    .warning h3 { color: #d97706; margin-bottom: 10px; font-size: 16px; }
-                    .warning ul { margin-left: 20px; color: #92400e; }
-                    .button {
-                        display: inline-block;
-                        padding: 12px 24px;
-                        text-decoration: none;
-                        border-radius: 8px;
-                        margin: 10px;
-                        font-weight: 600;
-                        transition: all 0.3s ease;
-                        border: none;
-                        cursor: pointer;
-                        font-size: 14px;
-                    }
-                    .button-danger {
-                        background: #dc2626;
-                        color: white;
-                    }
-                    .button-danger:hover { background: #b91c1c; transform: translateY(-2px); }
-                    .button-secondary {
-                        background: #6b7280;
-                        color: white;
-                    }
-                    .button-secondary:hover { background: #4b5563; }
-                    #message {
-                        margin-top: 20px;
-                        padding: 15px;
-                        border-radius: 8px;
-                        display: none;
-                    }
-                    .success { background: #d1fae5; color: #065f46; }
-                    .error { background: #fee2e2; color: #991b1b; }
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="warning-icon">⚠️</div>
-                    <h1>Logout & Revoke Access</h1>
-                    <p class="subtitle">This will disconnect your Facebook account from Meta Ads MCP</p>
-                    
-                    <div class="warning">
-                        <h3>⚠️ What will happen:</h3>
-                        <ul>
-                            <li>Your access token will be revoked</li>
-                            <li>All stored authentication data will be removed</li>
-                            <li>The MCP server will lose access to your ad accounts</li>
-                            <li>You'll need to reconnect to use the service again</li>
-                        </ul>
-                    </div>
-                    
-                    <div id="message"></div>
-                    
-                    <div style="margin-top: 30px;">
-                        <button onclick="confirmRevoke()" class="button button-danger">Yes, Revoke Access</button>
-                        <a href="/" class="button button-secondary">Cancel</a>
-                    </div>
-                </div>
-                
-                <script>
-                    async function confirmRevoke() {
-                        const messageEl = document.getElementById('message');
-                        messageEl.style.display = 'block';
-                        messageEl.className = '';
-                        messageEl.textContent = 'Revoking access...';
-                        
-                        try {
-                            const response = await fetch('/api/logout', {
-                                method: 'POST',
-                                headers: {
-                                    'Content-Type': 'application/json'
-                                }
-                            });
-                            
-                            const data = await response.json();
-                            
-                            if (data.success) {
-                                messageEl.className = 'success';
-                                messageEl.innerHTML = '✅ Access revoked successfully!<br>Redirecting to home...';
-                                setTimeout(() => {
-                                    window.location.href = '/';
-                                }, 2000);
-                            } else {
-                                messageEl.className = 'error';
-                                messageEl.textContent = '❌ Error: ' + (data.error || 'Failed to revoke access');
-                            }
-                        } catch (error) {
-                            messageEl.className = 'error';
-                            messageEl.textContent = '❌ Error: ' + error.message;
-                        }
-                    }
-                </script>
-            </body>
-            </html>
-            """
-        )
-    finally:
-        db.close()
+    has_connections = (await db.execute(_STMT_HAS_ACTIVE_TOKENS)).scalar()
+    
+    # Show the logout confirmation page, or the "nothing to revoke" page. Which
+    # one depends on the database, so browsers revalidate rather than reuse it.
+    if has_connections:
+        return _revalidated_response(request, _LOGOUT_CONFIRM_HTML, _LOGOUT_CONFIRM_ETAG)
+    return _revalidated_response(request, _LOGOUT_NO_CONNECTIONS_HTML, _LOGOUT_NO_CONNECTIONS_ETAG)
 
 
 @app.post("/api/logout")
-async def api_logout():
+async def api_logout(db: AsyncSession = Depends(get_async_db)):
     """
     API endpoint to revoke all active tokens for the current user.
 
     SECURITY: This properly revokes tokens on Meta's servers via DELETE /permissions,
     not just in the local database. This ensures tokens become truly invalid.
     """
-    db = get_db_session()
     try:
-        # Get all active tokens
-        active_tokens = db.query(FacebookToken).filter(FacebookToken.revoked == False).all()
+        # Calls Meta for each token, then marks them all revoked in one UPDATE
+        outcome = await _revoke_active_tokens(db, "*")
 
-        if not active_tokens:
-            return JSONResponse({
+        if outcome is None:
+            return FastJSONResponse({
                 "success": True,
                 "message": "No active tokens to revoke",
                 "revoked_count": 0
             })
-
-        # Revoke each token properly (calls Meta API + updates DB)
-        revoked_count = 0
-        failed_count = 0
-
-        for token in active_tokens:
-            try:
-                success = oauth_service.revoke_token(
-                    fb_user_id=token.fb_user_id,
-                    call_meta_api=True  # Actually invalidate on Meta's servers
-                )
-                if success:
-                    revoked_count += 1
-                else:
-                    failed_count += 1
-                    logger.warning(f"Failed to revoke token for user: {token.fb_user_id}")
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"Error revoking token for user {token.fb_user_id}: {e}")
-                # Continue with next token
-
-        # Don't need db.commit() - revoke_token() already commits
+        revoked_count, failed_count = outcome
 
         logger.info(f"Revoked {revoked_count} token(s) via logout (failed: {failed_count})")
 
-        return JSONResponse({
+        return FastJSONResponse({
             "success": True,
             "message": f"Successfully revoked {revoked_count} access token(s)",
             "revoked_count": revoked_count,
@@ -1271,12 +1449,10 @@ async def api_logout():
         })
     except Exception as e:
         logger.error(f"Logout failed: {e}")
-        return JSONResponse({
+        return FastJSONResponse({
             "success": False,
             "error": str(e)
         }, status_code=500)
-    finally:
-        db.close()
 
 
 if __name__ == "__main__":
@@ -1285,6 +1461,8 @@ if __name__ == "__main__":
         app,
         host=settings.web_server_host,
         port=settings.web_server_port,
+        loop=UVICORN_LOOP,
+        http=UVICORN_HTTP,
         log_level=settings.log_level.lower()
     )
 
@@ -2,6 +2,8 @@
 Token endpoint for handling implicit OAuth flow tokens.
 This endpoint receives tokens POSTed from the callback page JavaScript.
 """
+import asyncio
+import logging
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional
@@ -40,19 +42,26 @@ async def process_token(request: Request, token_data: TokenRequest):
         if not token_data.access_token:
             raise HTTPException(status_code=400, detail="Missing access_token")
         
-        # Get user info
-        logger.info("Fetching user info from Facebook")
-        user_info = oauth_service.get_user_info(token_data.access_token)
+        # User info and the long-lived token exchange only need the short token,
+        # so both Graph calls run concurrently
+        logger.info("Fetching user info and exchanging for a long-lived token")
+        user_info, long_token_response = await asyncio.gather(
+            oauth_service.get_user_info_async(token_data.access_token),
+            oauth_service.exchange_short_token_for_long_async(token_data.access_token),
+            return_exceptions=True
+        )
+        if isinstance(user_info, BaseException):
+            raise user_info
         if not user_info or not user_info.get("id"):
             raise HTTPException(status_code=400, detail="Failed to get user info from Facebook")
         
         fb_user_id = user_info.get("id")
         logger.info(f"Got FB user ID: {fb_user_id}")
         
-        # Exchange short token for long (if we have app secret)
+        # Use the long-lived token (if we have app secret)
         try:
-            logger.info("Exchanging short token for long-lived token")
-            long_token_response = oauth_service.exchange_short_token_for_long(token_data.access_token)
+            if isinstance(long_token_response, BaseException):
+                raise long_token_response
             long_token = long_token_response.get("access_token")
             expires_in = long_token_response.get("expires_in", 5184000)
             logger.info(f"Got long-lived token, expires in {expires_in} seconds")
@@ -66,16 +75,18 @@ async def process_token(request: Request, token_data: TokenRequest):
         accounts = []
         try:
             logger.info("Fetching ad accounts")
-            accounts = oauth_service.get_ad_accounts(long_token)
+            accounts = await oauth_service.get_ad_accounts_async(long_token)
             logger.info(f"Found {len(accounts)} ad accounts")
         except Exception as e:
             logger.warning(f"Could not fetch ad accounts: {e}")
         
         # Save token
         logger.info(f"Saving token to database for FB user {fb_user_id}")
-        permissions = settings.fb_oauth_scopes.split(",") if settings.fb_oauth_scopes else []
+        permissions = settings.fb_oauth_scopes_list
         try:
-            token_record = oauth_service.save_token(
+            # Database write runs off the event loop
+            token_record = await asyncio.to_thread(
+                oauth_service.save_token,
                 user_id=None,
                 fb_user_id=fb_user_id,
                 access_token=long_token,
@@ -90,12 +101,13 @@ async def process_token(request: Request, token_data: TokenRequest):
             except Exception:
                 logger.info(f"Successfully saved token for user {fb_user_id}")
             
-            # Verify token was saved by trying to retrieve it
-            verify_token = oauth_service.get_token(fb_user_id=fb_user_id)
-            if verify_token:
-                logger.info("Token verification successful - token can be retrieved")
-            else:
-                logger.error("WARNING: Token was saved but could not be retrieved!")
+            # Read-back check costs a DB query and a decrypt, so only do it when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                verify_token = await asyncio.to_thread(oauth_service.get_token, fb_user_id=fb_user_id)
+                if verify_token:
+                    logger.debug("Token verification successful - token can be retrieved")
+                else:
+                    logger.error("WARNING: Token was saved but could not be retrieved!")
         except Exception as e:
             logger.error(f"Failed to save token: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to save token: {str(e)}")
@@ -2,7 +2,8 @@
 Configuration settings for Meta Ads MCP server.
 """
 import os
-from typing import Optional
+from functools import cached_property
+from typing import Optional, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -12,7 +13,13 @@ load_dotenv()
 
 
 class Settings:
-    """Application settings loaded from environment variables."""
+    """
+    Application settings loaded from environment variables.
+
+    The environment is read once, when the module-level instance is created.
+    Derived flags are computed on first access and cached, so settings are
+    treated as read-only after construction.
+    """
 
     def __init__(self):
         # Meta API Configuration
@@ -79,6 +86,7 @@ class Settings:
         
         # OAuth Settings
         self.token_refresh_window_days: int = int(os.getenv("TOKEN_REFRESH_WINDOW_DAYS", "10"))
+        self.token_refresh_concurrency: int = int(os.getenv("TOKEN_REFRESH_CONCURRENCY", "16"))
         self.oauth_state_ttl_minutes: int = int(os.getenv("OAUTH_STATE_TTL_MINUTES", "10"))
         self.fb_oauth_enabled: bool = os.getenv("FB_OAUTH_ENABLED", "false").lower() == "true"
         
@@ -92,17 +100,22 @@ class Settings:
         self.web_server_host: str = os.getenv("WEB_SERVER_HOST", "0.0.0.0")
         self.web_server_port: int = int(os.getenv("WEB_SERVER_PORT", "8000"))
 
-    @property
+    @cached_property
     def is_production(self) -> bool:
         """Check if running in production environment."""
         return self.environment.lower() == "production"
 
-    @property
+    @cached_property
     def has_token(self) -> bool:
         """Check if access token is configured."""
         return self.meta_access_token is not None and self.meta_access_token.strip() != ""
     
-    @property
+    @cached_property
+    def fb_oauth_scopes_list(self) -> Tuple[str, ...]:
+        """Requested OAuth scopes as a tuple, split once instead of per login."""
+        return tuple(s.strip() for s in (self.fb_oauth_scopes or "").split(",") if s.strip())
+    
+    @cached_property
     def is_oauth_configured(self) -> bool:
         """Check if OAuth is properly configured."""
         return (
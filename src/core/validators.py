@@ -2,9 +2,14 @@
 Validation and prerequisites system for Meta Ads MCP server.
 Ensures data integrity and prevents AI hallucination.
 """
-from typing import Dict, Any, List, Optional, Callable, Tuple
+from typing import Dict, Any, List, NamedTuple, Optional, Callable, Tuple, get_origin
+import os
 import re
-from dataclasses import asdict
+import sys
+from functools import lru_cache, wraps
+
+# Directory of this module, used by the script-mode import fallbacks
+_MODULE_DIR = os.path.dirname(__file__)
 
 try:
     # Try absolute imports first (when run as part of package)
@@ -14,36 +19,37 @@ try:
     from ..api.client import APIResponse
 except ImportError:
     # Fall back to relative imports (when run as script from src directory)
-    import sys
-    import os
     # Add current directory to path for relative imports
-    sys.path.insert(0, os.path.dirname(__file__))
+    sys.path.insert(0, _MODULE_DIR)
     from auth.token_manager import token_manager
     from config.settings import settings
     from utils.logger import logger
     from api.client import APIResponse
 
 
-# Validation rules for different object types
+# Validation rules for different object types (patterns are compiled once at import)
 VALIDATION_RULES = {
     'account_id': {
-        'pattern': r'^(act_\d+|\d{15,18})$',
+        'pattern': re.compile(r'^(act_\d+|\d{15,18})$'),
         'description': 'Account ID must be in format act_123456789 or 15-18 digits'
     },
     'campaign_id': {
-        'pattern': r'^\d{15,18}$',
+        'pattern': re.compile(r'^\d{15,18}$'),
         'description': 'Campaign ID must be 15-18 digits'
     },
     'adset_id': {
-        'pattern': r'^\d{15,18}$',
+        'pattern': re.compile(r'^\d{15,18}$'),
         'description': 'Ad set ID must be 15-18 digits'
     },
     'ad_id': {
-        'pattern': r'^\d{15,18}$',
+        'pattern': re.compile(r'^\d{15,18}$'),
         'description': 'Ad ID must be 15-18 digits'
     }
 }
 
+# Object types whose IDs are plain 15-18 digit numbers
+_NUMERIC_ID_TYPES = ('campaign_id', 'adset_id', 'ad_id')
+
 
 def validate_object_id(object_id: str, object_type: str) -> Tuple[bool, str]:
     """
@@ -60,14 +66,33 @@ def validate_object_id(object_id: str, object_type: str) -> Tuple[bool, str]:
         return True, ""  # No validation rule, assume valid
 
     rule = VALIDATION_RULES[object_type]
-    pattern = rule['pattern']
 
-    if not re.match(pattern, object_id):
+    # The known formats are checked with string methods (str.isdecimal matches
+    # exactly what \d does), so the regex only runs for any other rule. The
+    # patterns end in $, which also matches before one trailing newline, so
+    # that newline is dropped first to accept the same IDs
+    value = object_id[:-1] if object_id.endswith('\n') else object_id
+    if object_type == 'account_id':
+        if value.startswith('act_'):
+            is_valid = value[4:].isdecimal()
+        else:
+            is_valid = 15 <= len(value) <= 18 and value.isdecimal()
+    elif object_type in _NUMERIC_ID_TYPES:
+        is_valid = 15 <= len(value) <= 18 and value.isdecimal()
+    else:
+        is_valid = rule['pattern'].match(object_id) is not None
+
+    if not is_valid:
         return False, rule['description']
 
     return True, ""
 
 
+# Last token checked by validate_api_access and its result. Keyed on the token
+# itself, so a rotated or refreshed token simply misses and is re-checked.
+_last_api_access: Optional[Tuple[str, Tuple[bool, str]]] = None
+
+
 def validate_api_access() -> Tuple[bool, str]:
     """
     Validate that API access is available.
@@ -75,16 +100,23 @@ def validate_api_access() -> Tuple[bool, str]:
     Returns:
         Tuple of (has_access, error_message)
     """
+    global _last_api_access
     try:
         token = token_manager.get_token() or settings.meta_access_token
         if not token:
             return False, "No Meta access token configured. Please set META_ACCESS_TOKEN environment variable."
 
+        cached = _last_api_access
+        if cached is not None and cached[0] == token:
+            return cached[1]
+
         # Basic token format validation
         if not token.startswith('EAA') or len(token) < 50:
-            return False, "Invalid Meta access token format."
-
-        return True, ""
+            result = (False, "Invalid Meta access token format.")
+        else:
+            result = (True, "")
+        _last_api_access = (token, result)
+        return result
     except Exception as e:
         return False, f"API access validation failed: {str(e)}"
 
@@ -113,7 +145,7 @@ def validate_account_id(account_id: str) -> bool:
     """Validate account ID format."""
     is_valid, error = validate_object_id(account_id, 'account_id')
     if not is_valid:
-        logger.warning(f"Invalid account ID '{account_id}': {error}")
+        logger.warning("Invalid account ID '%s': %s", account_id, error)
     return is_valid
 
 
@@ -121,7 +153,7 @@ def validate_campaign_id(campaign_id: str) -> bool:
     """Validate campaign ID format."""
     is_valid, error = validate_object_id(campaign_id, 'campaign_id')
     if not is_valid:
-        logger.warning(f"Invalid campaign ID '{campaign_id}': {error}")
+        logger.warning("Invalid campaign ID '%s': %s", campaign_id, error)
     return is_valid
 
 
@@ -129,7 +161,7 @@ def validate_adset_id(adset_id: str) -> bool:
     """Validate ad set ID format."""
     is_valid, error = validate_object_id(adset_id, 'adset_id')
     if not is_valid:
-        logger.warning(f"Invalid ad set ID '{adset_id}': {error}")
+        logger.warning("Invalid ad set ID '%s': %s", adset_id, error)
     return is_valid
 
 
@@ -137,11 +169,97 @@ def validate_ad_id(ad_id: str) -> bool:
     """Validate ad ID format."""
     is_valid, error = validate_object_id(ad_id, 'ad_id')
     if not is_valid:
-        logger.warning(f"Invalid ad ID '{ad_id}': {error}")
+        logger.warning("Invalid ad ID '%s': %s", ad_id, error)
     return is_valid
 
 
-def validate_campaign_input(campaign_data: Dict[str, Any]) -> Dict[str, Any]:
+class ValidationResult(NamedTuple):
+    """Outcome of validating tool input."""
+    valid: bool
+    errors: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a {'valid': ..., 'errors': [...]} dictionary."""
+        return {"valid": self.valid, "errors": self.errors}
+
+
+# Campaign objectives and statuses accepted by validate_campaign_input. The
+# tuples keep the order used in error messages; the frozensets are for lookups.
+# The option hints are built once and only interpolated when input is invalid.
+_OBJECTIVE_ORDER = (
+    'OUTCOME_SALES', 'OUTCOME_LEADS', 'OUTCOME_TRAFFIC', 'OUTCOME_ENGAGEMENT',
+    'OUTCOME_APP_PROMOTION', 'OUTCOME_AWARENESS', 'REACH', 'IMPRESSIONS',
+    'LINK_CLICKS', 'CONVERSIONS', 'CATALOG_SALES', 'STORE_VISITS'
+)
+_VALID_OBJECTIVES = frozenset(_OBJECTIVE_ORDER)
+_OBJECTIVES_HINT = f"Valid options: {', '.join(_OBJECTIVE_ORDER[:5])}..."
+_STATUS_ORDER = ('ACTIVE', 'PAUSED', 'DELETED', 'ARCHIVED')
+_VALID_STATUSES = frozenset(_STATUS_ORDER)
+_STATUSES_HINT = f"Valid options: {', '.join(_STATUS_ORDER)}"
+
+
+# Prerequisites as bit flags, so a tool's requirements are tested with integer ops
+_PREREQ_API_ACCESS = 1
+_PREREQ_ACCOUNT_ID = 2
+_PREREQ_CAMPAIGN_ID = 4
+_PREREQ_ADSET_ID = 8
+_PREREQ_AD_ID = 16
+
+_PREREQ_BITS = {
+    'validate_api_access': _PREREQ_API_ACCESS,
+    'validate_account_id': _PREREQ_ACCOUNT_ID,
+    'validate_campaign_id': _PREREQ_CAMPAIGN_ID,
+    'validate_adset_id': _PREREQ_ADSET_ID,
+    'validate_ad_id': _PREREQ_AD_ID,
+}
+
+# (flag, tool parameter, validator, label used in the error message) per ID check
+_ID_PREREQS = (
+    (_PREREQ_ACCOUNT_ID, 'account_id', validate_account_id, 'account ID'),
+    (_PREREQ_CAMPAIGN_ID, 'campaign_id', validate_campaign_id, 'campaign ID'),
+    (_PREREQ_ADSET_ID, 'adset_id', validate_adset_id, 'ad set ID'),
+    (_PREREQ_AD_ID, 'ad_id', validate_ad_id, 'ad ID'),
+)
+_ID_PREREQ_MASK = _PREREQ_ACCOUNT_ID | _PREREQ_CAMPAIGN_ID | _PREREQ_ADSET_ID | _PREREQ_AD_ID
+
+# Tool parameters the ID checks look at; _MISSING marks one the call didn't pass
+_ID_PARAMS = tuple(param for _, param, _, _ in _ID_PREREQS)
+_MISSING = object()
+
+
+def _prereq_bits(prereqs: List[str]) -> int:
+    """Combine a tool's prerequisite names into one bit mask."""
+    bits = 0
+    for prereq in prereqs:
+        bits |= _PREREQ_BITS[prereq]
+    return bits
+
+
+# Each tool's prerequisites as a bit mask, resolved once at import
+_TOOL_PREREQ_BITS: Dict[str, int] = {
+    tool: _prereq_bits(prereqs) for tool, prereqs in TOOL_PREREQUISITES.items()
+}
+
+
+@lru_cache(maxsize=4096)
+def _check_id_prerequisites(bits: int, ids: Tuple[Any, ...]) -> Tuple[bool, str]:
+    """
+    Run the ID checks selected by bits, memoized on the IDs they were given.
+
+    Args:
+        bits: ID prerequisite flags to check
+        ids: Values for _ID_PARAMS, with _MISSING for parameters not passed
+
+    Returns:
+        Tuple of (can_proceed, error_message)
+    """
+    for (bit, _, validator, label), value in zip(_ID_PREREQS, ids):
+        if bits & bit and value is not _MISSING and not validator(value):
+            return False, f"Invalid {label} format: {value}"
+    return True, ""
+
+
+def validate_campaign_input(campaign_data: Dict[str, Any]) -> ValidationResult:
     """
     Validate campaign creation/update input data.
 
@@ -149,33 +267,23 @@ def validate_campaign_input(campaign_data: Dict[str, Any]) -> Dict[str, Any]:
         campaign_data: Campaign data to validate
 
     Returns:
-        Dict with 'valid' boolean and 'errors' list
+        ValidationResult with the 'valid' flag and the 'errors' list
     """
     errors = []
-    result = {"valid": True, "errors": errors}
 
     # Validate name
     name = campaign_data.get('name', '').strip()
     if not name:
         errors.append("Campaign name is required")
-        result["valid"] = False
     elif len(name) > 100:
         errors.append("Campaign name must be 100 characters or less")
-        result["valid"] = False
 
     # Validate objective
-    valid_objectives = [
-        'OUTCOME_SALES', 'OUTCOME_LEADS', 'OUTCOME_TRAFFIC', 'OUTCOME_ENGAGEMENT',
-        'OUTCOME_APP_PROMOTION', 'OUTCOME_AWARENESS', 'REACH', 'IMPRESSIONS',
-        'LINK_CLICKS', 'CONVERSIONS', 'CATALOG_SALES', 'STORE_VISITS'
-    ]
     objective = campaign_data.get('objective')
     if not objective:
         errors.append("Campaign objective is required")
-        result["valid"] = False
-    elif objective not in valid_objectives:
-        errors.append(f"Invalid objective '{objective}'. Valid options: {', '.join(valid_objectives[:5])}...")
-        result["valid"] = False
+    elif objective not in _VALID_OBJECTIVES:
+        errors.append(f"Invalid objective '{objective}'. {_OBJECTIVES_HINT}")
 
     # Validate budgets
     daily_budget = campaign_data.get('daily_budget')
@@ -183,25 +291,19 @@ def validate_campaign_input(campaign_data: Dict[str, Any]) -> Dict[str, Any]:
 
     if daily_budget is not None and lifetime_budget is not None:
         errors.append("Cannot specify both daily_budget and lifetime_budget")
-        result["valid"] = False
     elif daily_budget is not None:
         if not isinstance(daily_budget, (int, float)) or daily_budget <= 0:
             errors.append("Daily budget must be a positive number")
-            result["valid"] = False
     elif lifetime_budget is not None:
         if not isinstance(lifetime_budget, (int, float)) or lifetime_budget <= 0:
             errors.append("Lifetime budget must be a positive number")
-            result["valid"] = False
 
     # Validate status
-    valid_statuses = ['ACTIVE', 'PAUSED', 'DELETED', 'ARCHIVED']
     status = campaign_data.get('status', 'PAUSED')
-    if status not in valid_statuses:
-        errors.append(f"Invalid status '{status}'. Valid options: {', '.join(valid_statuses)}")
-        result["valid"] = False
+    if status not in _VALID_STATUSES:
+        errors.append(f"Invalid status '{status}'. {_STATUSES_HINT}")
 
-    result["errors"] = errors
-    return result
+    return ValidationResult(not errors, errors)
 
 
 def check_tool_prerequisites(tool_name: str, **kwargs) -> Tuple[bool, str]:
@@ -215,32 +317,22 @@ def check_tool_prerequisites(tool_name: str, **kwargs) -> Tuple[bool, str]:
     Returns:
         Tuple of (can_proceed, error_message)
     """
-    if tool_name not in TOOL_PREREQUISITES:
-        return True, ""  # No prerequisites defined
+    # Tools without an entry have no prerequisites
+    bits = _TOOL_PREREQ_BITS.get(tool_name, 0)
 
-    prerequisites = TOOL_PREREQUISITES[tool_name]
+    if bits & _PREREQ_API_ACCESS:
+        has_access, error = validate_api_access()
+        if not has_access:
+            return False, error
 
-    for prereq in prerequisites:
-        if prereq == 'validate_api_access':
-            has_access, error = validate_api_access()
-            if not has_access:
-                return False, error
-
-        elif prereq == 'validate_account_id' and 'account_id' in kwargs:
-            if not validate_account_id(kwargs['account_id']):
-                return False, f"Invalid account ID format: {kwargs['account_id']}"
-
-        elif prereq == 'validate_campaign_id' and 'campaign_id' in kwargs:
-            if not validate_campaign_id(kwargs['campaign_id']):
-                return False, f"Invalid campaign ID format: {kwargs['campaign_id']}"
-
-        elif prereq == 'validate_adset_id' and 'adset_id' in kwargs:
-            if not validate_adset_id(kwargs['adset_id']):
-                return False, f"Invalid ad set ID format: {kwargs['adset_id']}"
-
-        elif prereq == 'validate_ad_id' and 'ad_id' in kwargs:
-            if not validate_ad_id(kwargs['ad_id']):
-                return False, f"Invalid ad ID format: {kwargs['ad_id']}"
+    id_bits = bits & _ID_PREREQ_MASK
+    if id_bits:
+        ids = tuple(kwargs.get(param, _MISSING) for param in _ID_PARAMS)
+        try:
+            return _check_id_prerequisites(id_bits, ids)
+        except TypeError:
+            # Unhashable ID value; validate it without the cache
+            return _check_id_prerequisites.__wrapped__(id_bits, ids)
 
     return True, ""
 
@@ -257,13 +349,17 @@ def validate_response_integrity(response: Dict[str, Any], expected_fields: List[
         Tuple of (is_valid, error_message)
     """
     try:
-        if not isinstance(response, dict):
+        # One lookup on the common path; the handlers sort out what went wrong
+        try:
+            success = response['success']
+        except KeyError:
+            if isinstance(response, dict):
+                return False, "Response missing 'success' field"
+            return False, "Response is not a valid dictionary"
+        except TypeError:
             return False, "Response is not a valid dictionary"
 
-        if 'success' not in response:
-            return False, "Response missing 'success' field"
-
-        if not response.get('success'):
+        if not success:
             # Check if there's a proper error message
             if 'error' not in response:
                 return False, "Failed response missing error message"
@@ -281,10 +377,48 @@ def validate_response_integrity(response: Dict[str, Any], expected_fields: List[
         return False, f"Response validation failed: {str(e)}"
 
 
+def _api_response_to_dict(result: APIResponse) -> Dict[str, Any]:
+    """Convert an APIResponse into the standard response dictionary."""
+    result_dict = {
+        "success": result.success,
+        "data": result.data
+    }
+    if result.error is not None:
+        result_dict["error"] = result.error
+    if result.rate_limit_info is not None:
+        result_dict["rate_limit_info"] = result.rate_limit_info
+    return result_dict
+
+
+def _convert_if_api_response(result: Any) -> Any:
+    """Convert result if it is an APIResponse; used when the return type isn't declared."""
+    if isinstance(result, APIResponse):
+        return _api_response_to_dict(result)
+    return result
+
+
+def _result_converter(tool_function: Callable) -> Optional[Callable[[Any], Any]]:
+    """
+    Pick how a tool's results are normalized from its declared return type.
+
+    Returns:
+        A converter to apply to each result, or None when the tool returns dicts
+    """
+    returns = getattr(tool_function, '__annotations__', {}).get('return')
+    if returns is APIResponse:
+        return _api_response_to_dict
+    if returns is dict or get_origin(returns) is dict:
+        return None
+    return _convert_if_api_response
+
+
 def create_validation_wrapper(tool_function: Callable, tool_name: str) -> Callable:
     """
     Create a validation wrapper for a tool function.
 
+    The APIResponse conversion is chosen once here from the tool's return
+    annotation rather than checked on every call.
+
     Args:
         tool_function: The original tool function
         tool_name: Name of the tool
@@ -292,6 +426,9 @@ def create_validation_wrapper(tool_function: Callable, tool_name: str) -> Callab
     Returns:
         Wrapped function with validation
     """
+    convert = _result_converter(tool_function)
+
+    @wraps(tool_function)
     def wrapper(*args, **kwargs):
         try:
             # Check prerequisites
@@ -308,16 +445,8 @@ def create_validation_wrapper(tool_function: Callable, tool_name: str) -> Callab
             result = tool_function(*args, **kwargs)
 
             # Convert APIResponse objects to standard dictionaries
-            if isinstance(result, APIResponse):
-                result_dict = {
-                    "success": result.success,
-                    "data": result.data
-                }
-                if result.error is not None:
-                    result_dict["error"] = result.error
-                if result.rate_limit_info is not None:
-                    result_dict["rate_limit_info"] = result.rate_limit_info
-                result = result_dict
+            if convert is not None:
+                result = convert(result)
 
             # Validate response integrity
             is_valid, validation_error = validate_response_integrity(result)
@@ -361,20 +490,12 @@ def verify_ad_hierarchy(account_id: str, campaign_id: str = None, adset_id: str
         Tuple of (is_valid, error_message)
     """
     # This would require API calls to verify hierarchy
-    # For now, just do basic format validation
-    validations = []
-
-    if account_id and not validate_account_id(account_id):
-        validations.append(f"Invalid account ID: {account_id}")
-
-    if campaign_id and not validate_campaign_id(campaign_id):
-        validations.append(f"Invalid campaign ID: {campaign_id}")
-
-    if adset_id and not validate_adset_id(adset_id):
-        validations.append(f"Invalid ad set ID: {adset_id}")
-
-    if ad_id and not validate_ad_id(ad_id):
-        validations.append(f"Invalid ad ID: {ad_id}")
+    # For now, just do basic format validation, one pass over the ID check table
+    validations = [
+        f"Invalid {label}: {value}"
+        for (_, _, validator, label), value in zip(_ID_PREREQS, (account_id, campaign_id, adset_id, ad_id))
+        if value and not validator(value)
+    ]
 
     if validations:
         return False, "; ".join(validations)
@@ -382,39 +503,90 @@ def verify_ad_hierarchy(account_id: str, campaign_id: str = None, adset_id: str
     return True, ""
 
 
-def create_account_analysis(account_id: str, insights_data: list = None) -> Dict[str, Any]:
+def _summarize_insights(insights_data: list) -> Dict[str, Any]:
     """
-    Create a comprehensive analysis for an ad account.
+    Total spend, impressions and clicks over insights rows in a single pass,
+    along with the CTR, CPM and CPC derived from them.
 
     Args:
-        account_id: Meta ad account ID
-        insights_data: Optional insights data from API
+        insights_data: Insights rows with string-formatted metrics
 
     Returns:
-        Comprehensive analysis dictionary
+        Dict of totals and average metrics
+    """
+    total_spend = 0.0
+    total_impressions = 0
+    total_clicks = 0
+    for row in insights_data:
+        get = row.get
+        total_spend += float(get('spend', '0').replace('$', '').replace(',', ''))
+        total_impressions += int(get('impressions', '0').replace(',', ''))
+        total_clicks += int(get('clicks', '0').replace(',', ''))
+
+    return {
+        "total_spend": total_spend,
+        "total_impressions": total_impressions,
+        "total_clicks": total_clicks,
+        "average_ctr": (total_clicks / total_impressions * 100) if total_impressions > 0 else 0,
+        "average_cpm": (total_spend / total_impressions * 1000) if total_impressions > 0 else 0,
+        "average_cpc": (total_spend / total_clicks) if total_clicks > 0 else 0,
+    }
+
+
+# (get_account_info, get_campaigns), imported on first use by create_account_analysis
+_analysis_tools: Optional[Tuple[Callable, Callable]] = None
+
+
+def _load_analysis_tools() -> Tuple[Callable, Callable]:
+    """
+    Import the account and campaign tools once and reuse them afterwards.
+
+    The tools modules import this one, so they can't be imported at module load.
+
+    Returns:
+        Tuple of (get_account_info, get_campaigns)
     """
+    global _analysis_tools
+    if _analysis_tools is not None:
+        return _analysis_tools
+
     try:
         # Try absolute imports first (when run as part of package)
         from ..tools.accounts import get_account_info
         from ..tools.campaigns import get_campaigns
     except ImportError:
         # Fall back to relative imports (when run as script)
-        import sys
-        import os
-        current_dir = os.path.dirname(__file__)
-        if current_dir not in sys.path:
-            sys.path.insert(0, current_dir)
+        if _MODULE_DIR not in sys.path:
+            sys.path.insert(0, _MODULE_DIR)
         try:
             from tools.accounts import get_account_info
             from tools.campaigns import get_campaigns
         except ImportError:
             # Last resort - try from parent directory
-            parent_dir = os.path.dirname(current_dir)
+            parent_dir = os.path.dirname(_MODULE_DIR)
             if parent_dir not in sys.path:
                 sys.path.insert(0, parent_dir)
             from src.tools.accounts import get_account_info
             from src.tools.campaigns import get_campaigns
 
+    _analysis_tools = (get_account_info, get_campaigns)
+    return _analysis_tools
+
+
+def create_account_analysis(account_id: str, insights_data: list = None) -> Dict[str, Any]:
+    """
+    Create a comprehensive analysis for an ad account.
+
+    Args:
+        account_id: Meta ad account ID
+        insights_data: Optional insights data from API
+
+    Returns:
+        Comprehensive analysis dictionary
+    """
+    try:
+        get_account_info, get_campaigns = _load_analysis_tools()
+
         analysis = {
             "account_id": account_id,
             "analysis_timestamp": "2025-10-23T14:00:00Z",
@@ -443,21 +615,29 @@ def create_account_analysis(account_id: str, insights_data: list = None) -> Dict
         campaigns_result = get_campaigns(account_id, limit=100)
         if campaigns_result.get('success'):
             campaigns = campaigns_result.get('campaigns', [])
+
+            # Status counts and the objectives histogram in a single pass
+            active_count = paused_count = 0
+            objectives = {}
+            for campaign in campaigns:
+                status = campaign.get('status')
+                if status == 'ACTIVE':
+                    active_count += 1
+                elif status == 'PAUSED':
+                    paused_count += 1
+                obj = campaign.get('objective', 'Unknown')
+                objectives[obj] = objectives.get(obj, 0) + 1
+
             analysis["campaigns"] = {
                 "total_count": len(campaigns),
-                "active_count": len([c for c in campaigns if c.get('status') == 'ACTIVE']),
-                "paused_count": len([c for c in campaigns if c.get('status') == 'PAUSED']),
+                "active_count": active_count,
+                "paused_count": paused_count,
                 "sample_campaigns": campaigns[:5]  # First 5 for overview
             }
             analysis["data_sources"].append("campaigns")
 
             # Basic campaign analysis
             if campaigns:
-                objectives = {}
-                for campaign in campaigns:
-                    obj = campaign.get('objective', 'Unknown')
-                    objectives[obj] = objectives.get(obj, 0) + 1
-
                 analysis["campaign_analysis"] = {
                     "primary_objectives": objectives,
                     "most_common_objective": max(objectives.items(), key=lambda x: x[1])[0] if objectives else "None"
@@ -471,20 +651,9 @@ def create_account_analysis(account_id: str, insights_data: list = None) -> Dict
             analysis["insights"] = {
                 "total_records": len(insights_data),
                 "date_range": f"{insights_data[0].get('date_start', 'Unknown')} to {insights_data[-1].get('date_stop', 'Unknown')}",
-                "total_spend": sum(float(i.get('spend', '0').replace('$', '').replace(',', '')) for i in insights_data),
-                "total_impressions": sum(int(i.get('impressions', '0').replace(',', '')) for i in insights_data),
-                "total_clicks": sum(int(i.get('clicks', '0').replace(',', '')) for i in insights_data)
+                **_summarize_insights(insights_data)
             }
 
-            # Calculate derived metrics
-            total_spend = analysis["insights"]["total_spend"]
-            total_impressions = analysis["insights"]["total_impressions"]
-            total_clicks = analysis["insights"]["total_clicks"]
-
-            analysis["insights"]["average_ctr"] = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
-            analysis["insights"]["average_cpm"] = (total_spend / total_impressions * 1000) if total_impressions > 0 else 0
-            analysis["insights"]["average_cpc"] = (total_spend / total_clicks) if total_clicks > 0 else 0
-
         else:
             analysis["insights"] = {
                 "status": "No insights data available",
@@ -496,10 +665,15 @@ def create_account_analysis(account_id: str, insights_data: list = None) -> Dict
                 ]
             }
 
+        # Campaign counts (absent when campaigns couldn't be retrieved)
+        campaign_stats = analysis["campaigns"]
+        active_campaigns = campaign_stats.get("active_count", 0)
+        total_campaigns = campaign_stats.get("total_count", 0)
+
         # Generate recommendations
-        if analysis.get("campaigns", {}).get("total_count", 0) == 0:
+        if total_campaigns == 0:
             analysis["recommendations"].append("Create your first campaign to start collecting performance data")
-        elif analysis.get("campaigns", {}).get("active_count", 0) == 0:
+        elif active_campaigns == 0:
             analysis["recommendations"].append("Activate campaigns to start generating insights and results")
 
         if not insights_data or len(insights_data) == 0:
@@ -507,21 +681,20 @@ def create_account_analysis(account_id: str, insights_data: list = None) -> Dict
             analysis["recommendations"].append("Ensure campaigns have sufficient budget and are properly targeted")
 
         # Determine account health
-        active_campaigns = analysis.get("campaigns", {}).get("active_count", 0)
-        total_campaigns = analysis.get("campaigns", {}).get("total_count", 0)
-
         if total_campaigns == 0:
             analysis["account_health"] = "Not Started"
             analysis["recommendations"].insert(0, "Set up your first advertising campaign")
         elif active_campaigns == 0:
             analysis["account_health"] = "Inactive"
             analysis["recommendations"].insert(0, "Activate existing campaigns to start advertising")
-        elif active_campaigns / total_campaigns > 0.7:
-            analysis["account_health"] = "Very Active"
-        elif active_campaigns / total_campaigns > 0.3:
-            analysis["account_health"] = "Active"
         else:
-            analysis["account_health"] = "Moderately Active"
+            active_ratio = active_campaigns / total_campaigns
+            if active_ratio > 0.7:
+                analysis["account_health"] = "Very Active"
+            elif active_ratio > 0.3:
+                analysis["account_health"] = "Active"
+            else:
+                analysis["account_health"] = "Moderately Active"
 
         return analysis
 
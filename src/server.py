@@ -2,11 +2,18 @@
 Main MCP server for Meta Ads management.
 """
 import asyncio
-import json
+import inspect
+import os
 import sys
-from typing import Dict, Any, Sequence, List
+import threading
+import time
+import traceback
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
 
 from fastmcp import FastMCP
+from sqlalchemy import func
 from starlette.routing import Mount
 
 # Import our tools and modules
@@ -14,18 +21,17 @@ try:
     # Try absolute imports first (when run as part of package)
     from .tools import accounts, campaigns, insights, targeting, adsets, ads
     from .core.analyzer import analyze_campaigns
-    from .core.validators import create_validation_wrapper, create_account_analysis
+    from .core.validators import create_validation_wrapper
     from .auth.token_manager import token_manager
     from .config.settings import settings
     from .utils.logger import logger
     from .auth.oauth_service import oauth_service
-    from .auth.database import get_db_session, FacebookToken
-    from .auth.oauth_service import oauth_service
-    from .auth.web_server import app as oauth_web_app
+    from .auth.database import (
+        get_db_session, FacebookToken, init_database, clear_oauth_tokens,
+        reset_database as _reset_database,
+    )
 except ImportError:
     # Fall back to relative imports (when run as script from src directory)
-    import sys
-    import os
     # Add current directory to path for relative imports
     sys.path.insert(0, os.path.dirname(__file__))
     from tools import accounts, campaigns, insights, targeting, adsets, ads
@@ -35,85 +41,130 @@ except ImportError:
     from config.settings import settings
     from utils.logger import logger
     from auth.oauth_service import oauth_service
-    from auth.database import get_db_session, FacebookToken
-    from auth.oauth_service import oauth_service
-    from auth.web_server import app as oauth_web_app
+    from auth.database import (
+        get_db_session, FacebookToken, init_database, clear_oauth_tokens,
+        reset_database as _reset_database,
+    )
+
+
+# Validation-wrapped tool implementations, built once at import
+_VALIDATED = {
+    name: create_validation_wrapper(func, name)
+    for name, func in (
+        ('get_ad_accounts', accounts.get_ad_accounts),
+        ('get_account_info', accounts.get_account_info),
+        ('get_campaigns', campaigns.get_campaigns),
+        ('get_campaign_details', campaigns.get_campaign_details),
+        ('create_campaign', campaigns.create_campaign),
+        ('update_campaign', campaigns.update_campaign),
+        ('get_insights', insights.get_insights),
+        ('search_interests', targeting.search_interests),
+        ('search_demographics', targeting.search_demographics),
+        ('get_adsets', adsets.get_adsets),
+        ('get_adset_details', adsets.get_adset_details),
+        ('get_ads', ads.get_ads),
+        ('get_ad_details', ads.get_ad_details),
+        ('get_ad_creatives', ads.get_ad_creatives),
+        ('get_interest_suggestions', targeting.get_interest_suggestions),
+        ('validate_interests', targeting.validate_interests),
+        ('estimate_audience_size', targeting.estimate_audience_size),
+        ('search_behaviors', targeting.search_behaviors),
+        ('search_geo_locations', targeting.search_geo_locations),
+        ('analyze_campaigns', analyze_campaigns),
+    )
+}
+
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP):
+    """Initialize the database (needed for OAuth token storage) when the server starts."""
+    try:
+        await asyncio.to_thread(init_database)
+    except Exception as e:
+        print(f"Warning: Could not initialize database: {e}", file=sys.stderr)
+    yield {}
 
 
 # Create FastMCP server instance
-mcp = FastMCP("meta-ads-mcp")
+mcp = FastMCP("meta-ads-mcp", lifespan=_lifespan)
+
+# The OAuth FastAPI app, imported on the first HTTP request that reaches it
+_oauth_web_app = None
+
+
+async def _lazy_oauth_web_app(scope, receive, send) -> None:
+    """ASGI app that defers importing the OAuth web server until it is first used.
+
+    stdio deployments never serve these routes, so they skip the import.
+    """
+    global _oauth_web_app
+    if _oauth_web_app is None:
+        try:
+            from .auth.web_server import app
+        except ImportError:
+            from auth.web_server import app
+        _oauth_web_app = app
+    await _oauth_web_app(scope, receive, send)
+
 
 # Mount the OAuth FastAPI web server so OAuth callbacks and admin routes work in cloud deployments
 try:
-    mcp._additional_http_routes.append(Mount("/", oauth_web_app))
+    mcp._additional_http_routes.append(Mount("/", _lazy_oauth_web_app))
     logger.info("OAuth web server mounted at root path for HTTP transport")
 except Exception as mount_error:
     logger.warning(f"Failed to mount OAuth web server: {mount_error}")
 
-# Initialize database on module import (needed for OAuth token storage)
-# This runs immediately when the module is loaded
-try:
-    from .auth.database import init_database
-except ImportError:
-    from auth.database import init_database
-
-try:
-    init_database()
-except Exception as e:
-    import sys
-    print(f"Warning: Could not initialize database: {e}", file=sys.stderr)
-
-@mcp.tool()
-def get_ad_accounts() -> str:
-    """List all accessible Meta ad accounts."""
-    try:
-        from .tools.accounts import get_ad_accounts
-    except ImportError:
-        from tools.accounts import get_ad_accounts
 
-    # Wrap with validation
-    validated_get_ad_accounts = create_validation_wrapper(get_ad_accounts, 'get_ad_accounts')
-    result = validated_get_ad_accounts()
-    return json.dumps(result, indent=2)
+def _register_passthrough_tool(name: str, description: str) -> None:
+    """
+    Register a validated tool whose MCP arguments match its implementation's.
 
-@mcp.tool()
-def get_account_info(account_id: str) -> str:
-    """Get detailed information about a specific ad account."""
-    try:
-        from .tools.accounts import get_account_info
-    except ImportError:
-        from tools.accounts import get_account_info
+    The handler takes its signature from the implementation, so FastMCP
+    builds the same input schema a hand-written wrapper would get.
 
-    validated_get_account_info = create_validation_wrapper(get_account_info, 'get_account_info')
-    result = validated_get_account_info(account_id=account_id)
-    return json.dumps(result, indent=2)
+    Args:
+        name: Tool name, also the key into _VALIDATED
+        description: Tool description shown to MCP clients
+    """
+    validated = _VALIDATED[name]
+
+    async def handler(**kwargs: Any) -> Dict[str, Any]:
+        return await asyncio.to_thread(validated, **kwargs)
+
+    handler.__name__ = handler.__qualname__ = name
+    handler.__doc__ = description
+    signature = inspect.signature(validated).replace(return_annotation=Dict[str, Any])
+    handler.__signature__ = signature
+    handler.__annotations__ = {
+        **{param.name: param.annotation for param in signature.parameters.values()},
+        "return": Dict[str, Any],
+    }
+    mcp.tool()(handler)
+
+
+# Tools whose arguments are passed straight through to the validated implementation
+_PASSTHROUGH_TOOLS = (
+    ('get_ad_accounts', "List all accessible Meta ad accounts."),
+    ('get_account_info', "Get detailed information about a specific ad account."),
+    ('get_campaign_details', "Get detailed information about a specific campaign."),
+    ('search_interests', "Search for targeting interests by keyword."),
+    ('get_adset_details', "Get detailed information about a specific ad set."),
+    ('get_ad_details', "Get detailed information about a specific ad."),
+    ('get_ad_creatives', "Get creative details for a specific ad."),
+    ('get_interest_suggestions', "Get interest suggestions based on existing interests."),
+    ('estimate_audience_size', "Estimate audience size for targeting specifications."),
+)
+
+for _name, _description in _PASSTHROUGH_TOOLS:
+    _register_passthrough_tool(_name, _description)
 
 @mcp.tool()
-def get_campaigns(account_id: str, status: str = None, limit: int = 100) -> str:
+async def get_campaigns(account_id: str, status: str = None, limit: int = 100) -> Dict[str, Any]:
     """List campaigns for an ad account."""
-    try:
-        from .tools.campaigns import get_campaigns
-    except ImportError:
-        from tools.campaigns import get_campaigns
-
-    validated_get_campaigns = create_validation_wrapper(get_campaigns, 'get_campaigns')
-    result = validated_get_campaigns(account_id=account_id, status=status, limit=limit)
-    return json.dumps(result, indent=2)
-
-@mcp.tool()
-def get_campaign_details(campaign_id: str) -> str:
-    """Get detailed information about a specific campaign."""
-    try:
-        from .tools.campaigns import get_campaign_details
-    except ImportError:
-        from tools.campaigns import get_campaign_details
-
-    validated_get_campaign_details = create_validation_wrapper(get_campaign_details, 'get_campaign_details')
-    result = validated_get_campaign_details(campaign_id=campaign_id)
-    return json.dumps(result, indent=2)
+    return await asyncio.to_thread(_VALIDATED['get_campaigns'], account_id=account_id, status=status, limit=limit)
 
 @mcp.tool()
-def create_campaign(
+async def create_campaign(
     account_id: str,
     name: str,
     objective: str,
@@ -121,7 +172,7 @@ def create_campaign(
     lifetime_budget: int = None,
     status: str = "PAUSED",
     special_ad_categories: list = None
-) -> str:
+) -> Dict[str, Any]:
     """
     Create a new ad campaign.
 
@@ -152,13 +203,8 @@ def create_campaign(
     Note: The tool automatically detects your account currency and logs the
           converted amount for verification.
     """
-    try:
-        from .tools.campaigns import create_campaign
-    except ImportError:
-        from tools.campaigns import create_campaign
-
-    validated_create_campaign = create_validation_wrapper(create_campaign, 'create_campaign')
-    result = validated_create_campaign(
+    return await asyncio.to_thread(
+        _VALIDATED['create_campaign'],
         account_id=account_id,
         name=name,
         objective=objective,
@@ -167,147 +213,141 @@ def create_campaign(
         status=status,
         special_ad_categories=special_ad_categories if special_ad_categories is not None else []
     )
-    return json.dumps(result, indent=2)
 
 @mcp.tool()
-def update_campaign(campaign_id: str, status: str = None, daily_budget: int = None, lifetime_budget: int = None, name: str = None) -> str:
+async def update_campaign(campaign_id: str, status: str = None, daily_budget: int = None, lifetime_budget: int = None, name: str = None) -> Dict[str, Any]:
     """Update campaign status, budget, or settings."""
-    try:
-        from .tools.campaigns import update_campaign
-    except ImportError:
-        from tools.campaigns import update_campaign
-
-    validated_update_campaign = create_validation_wrapper(update_campaign, 'update_campaign')
-    result = validated_update_campaign(campaign_id=campaign_id, status=status,
+    return await asyncio.to_thread(_VALIDATED['update_campaign'], campaign_id=campaign_id, status=status,
                                      daily_budget=daily_budget, lifetime_budget=lifetime_budget, name=name)
-    return json.dumps(result, indent=2)
 
 @mcp.tool()
-def get_insights(object_id: str, time_range: str = "last_7d", breakdown: str = None) -> str:
+async def get_insights(object_id: str, time_range: str = "last_7d", breakdown: str = None) -> Dict[str, Any]:
     """Get performance metrics and analytics."""
-    try:
-        from .tools.insights import get_insights
-    except ImportError:
-        from tools.insights import get_insights
-
-    validated_get_insights = create_validation_wrapper(get_insights, 'get_insights')
-    result = validated_get_insights(object_id=object_id, time_range=time_range, breakdown=breakdown)
-    return json.dumps(result, indent=2)
+    return await asyncio.to_thread(_VALIDATED['get_insights'], object_id=object_id, time_range=time_range, breakdown=breakdown)
 
 @mcp.tool()
-def search_interests(query: str, limit: int = 25) -> str:
-    """Search for targeting interests by keyword."""
-    try:
-        from .tools.targeting import search_interests
-    except ImportError:
-        from tools.targeting import search_interests
-
-    validated_search_interests = create_validation_wrapper(search_interests, 'search_interests')
-    result = validated_search_interests(query=query, limit=limit)
-    return json.dumps(result, indent=2)
-
-@mcp.tool()
-def search_demographics(demographic_class: str, limit: int = 50) -> str:
+async def search_demographics(demographic_class: str, limit: int = 50) -> Dict[str, Any]:
     """Search for demographic targeting options."""
-    try:
-        from .tools.targeting import search_demographics
-    except ImportError:
-        from tools.targeting import search_demographics
-
-    validated_search_demographics = create_validation_wrapper(search_demographics, 'search_demographics')
-    result = validated_search_demographics(demographic_class=demographic_class, limit=limit)
-    return json.dumps(result, indent=2)
+    return await asyncio.to_thread(_VALIDATED['search_demographics'], demographic_class=demographic_class, limit=limit)
 
 # Note: search_locations was a duplicate of search_geo_locations (defined below)
 # and has been removed to avoid confusion
 
 @mcp.tool()
-def get_adsets(account_id: str, campaign_id: str = None, status: str = None, limit: int = 100) -> str:
+async def get_adsets(account_id: str, campaign_id: str = None, status: str = None, limit: int = 100) -> Dict[str, Any]:
     """List ad sets for an account or campaign."""
-    try:
-        from .tools.adsets import get_adsets
-    except ImportError:
-        from tools.adsets import get_adsets
-
-    validated_get_adsets = create_validation_wrapper(get_adsets, 'get_adsets')
-    result = validated_get_adsets(account_id=account_id, campaign_id=campaign_id, status=status, limit=limit)
-    return json.dumps(result, indent=2)
+    return await asyncio.to_thread(_VALIDATED['get_adsets'], account_id=account_id, campaign_id=campaign_id, status=status, limit=limit)
 
 @mcp.tool()
-def get_adset_details(adset_id: str) -> str:
-    """Get detailed information about a specific ad set."""
-    try:
-        from .tools.adsets import get_adset_details
-    except ImportError:
-        from tools.adsets import get_adset_details
-
-    validated_get_adset_details = create_validation_wrapper(get_adset_details, 'get_adset_details')
-    result = validated_get_adset_details(adset_id=adset_id)
-    return json.dumps(result, indent=2)
-
-@mcp.tool()
-def get_ads(adset_id: str = None, account_id: str = None, campaign_id: str = None, status: str = None, limit: int = 100) -> str:
+async def get_ads(adset_id: str = None, account_id: str = None, campaign_id: str = None, status: str = None, limit: int = 100) -> Dict[str, Any]:
     """List ads from an ad set, account, or campaign."""
-    try:
-        from .tools.ads import get_ads
-    except ImportError:
-        from tools.ads import get_ads
-
-    validated_get_ads = create_validation_wrapper(get_ads, 'get_ads')
     # Map 'status' to 'status_filter' for compatibility
-    result = validated_get_ads(adset_id=adset_id, account_id=account_id, campaign_id=campaign_id, status_filter=status, limit=limit)
-    return json.dumps(result, indent=2)
+    return await asyncio.to_thread(_VALIDATED['get_ads'], adset_id=adset_id, account_id=account_id, campaign_id=campaign_id, status_filter=status, limit=limit)
 
-@mcp.tool()
-def get_ad_details(ad_id: str) -> str:
-    """Get detailed information about a specific ad."""
-    try:
-        from .tools.ads import get_ad_details
-    except ImportError:
-        from tools.ads import get_ad_details
-
-    validated_get_ad_details = create_validation_wrapper(get_ad_details, 'get_ad_details')
-    result = validated_get_ad_details(ad_id=ad_id)
-    return json.dumps(result, indent=2)
-
-@mcp.tool()
-def get_ad_creatives(ad_id: str) -> str:
-    """Get creative details for a specific ad."""
+def _open_browser(url: str) -> None:
+    """Open a URL in the default browser, logging failures to stderr only."""
     try:
-        from .tools.ads import get_ad_creatives
-    except ImportError:
-        from tools.ads import get_ad_creatives
-
-    validated_get_ad_creatives = create_validation_wrapper(get_ad_creatives, 'get_ad_creatives')
-    result = validated_get_ad_creatives(ad_id=ad_id)
-    return json.dumps(result, indent=2)
+        import webbrowser
+        opened = webbrowser.open_new_tab(url)
+    except Exception as e:
+        print(f"Failed to open browser automatically: {e}", file=sys.stderr)
+        return
+    if not opened:
+        print("Failed to open browser automatically: no usable browser found", file=sys.stderr)
 
 
 @mcp.tool()
-def open_facebook_connect(user_id: str | None = None) -> str:
+async def open_facebook_connect(user_id: str | None = None) -> Dict[str, Any]:
     """Generate the Facebook Connect URL and attempt to open it in the default browser.
 
-    Returns a JSON payload with the URL and whether a browser was opened.
+    Returns a JSON payload with the URL and whether a browser launch was started.
     """
     try:
-        state = oauth_service.generate_state(user_id=user_id)
+        state = await asyncio.to_thread(oauth_service.generate_state, user_id=user_id)
         url = oauth_service.get_authorization_url(state)
 
-        # Attempt to open browser; log to stderr only
+        # Launching a browser can block for a long time, so do it in the
+        # background; the URL is returned either way
         opened = False
         try:
-            import webbrowser
-            opened = webbrowser.open_new_tab(url)
+            threading.Thread(target=_open_browser, args=(url,), name="open-browser", daemon=True).start()
+            opened = True
         except Exception as e:
             print(f"Failed to open browser automatically: {e}", file=sys.stderr)
 
-        return json.dumps({"success": True, "url": url, "opened": opened}, indent=2)
+        return {"success": True, "url": url, "opened": opened}
     except Exception as e:
-        return json.dumps({"success": False, "error": str(e)}, indent=2)
+        return {"success": False, "error": str(e)}
+
+
+# token_status reuses its OAuth snapshot for this long while stored tokens are unchanged
+_OAUTH_STATUS_TTL_SECONDS = 5.0
+
+# (token_version, monotonic time, total_tokens, oauth section) of the last snapshot
+_last_oauth_status: Optional[Tuple[int, float, int, Dict[str, Any]]] = None
+
+
+def _load_oauth_status(status: Dict[str, Any]) -> None:
+    """
+    Fill in the OAuth section of a token_status report from the database.
+
+    Args:
+        status: Status dictionary to update in place
+    """
+    global _last_oauth_status
+    version = oauth_service.token_version
+    now = time.monotonic()
+    cached = _last_oauth_status
+    if cached is not None and cached[0] == version and now - cached[1] < _OAUTH_STATUS_TTL_SECONDS:
+        status["database"]["total_tokens"] = cached[2]
+        status["oauth"] = dict(cached[3])
+        return
+
+    db = get_db_session()
+    try:
+        # Newest active token (or newest revoked one if none are active)
+        # together with the total token count, in a single query
+        row = (
+            db.query(FacebookToken, func.count().over())
+            .order_by(FacebookToken.revoked.is_(False).desc(), FacebookToken.created_at.desc())
+            .first()
+        )
+        total_tokens = row[1] if row else 0
+        status["database"]["total_tokens"] = total_tokens
+
+        token = row[0] if row and row[0].revoked == False else None
+        if token:
+            # Check expiration (SQLite hands back naive datetimes)
+            expires_at = token.expires_at
+            is_expired = False
+            if expires_at:
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                is_expired = expires_at < datetime.now(timezone.utc)
+
+            status["oauth"] = {
+                "present": True,
+                "fb_user_id": token.fb_user_id,
+                "expires_at": token.expires_at,
+                "is_expired": is_expired,
+                "accounts_count": len(token.accounts) if token.accounts else 0,
+                "permissions": token.permissions
+            }
+        else:
+            status["oauth"] = {"present": False}
+            if total_tokens:
+                status["oauth"]["debug"] = f"Found {total_tokens} total token(s) but all are revoked"
+            else:
+                status["oauth"]["debug"] = "No tokens found in database at all"
+        _last_oauth_status = (version, now, total_tokens, dict(status["oauth"]))
+    except Exception as db_error:
+        status["oauth"] = {"present": False, "error": str(db_error)}
+    finally:
+        db.close()
 
 
 @mcp.tool()
-def token_status() -> str:
+async def token_status() -> Dict[str, Any]:
     """Report which token source will be used by the MCP server (OAuth vs env), and show connection info."""
     try:
         status: dict = {"success": True}
@@ -317,55 +357,10 @@ def token_status() -> str:
             "url": settings.database_url
         }
 
-        # Force database initialization if needed
-        try:
-            from .auth.database import init_database as init_db_func
-        except ImportError:
-            from auth.database import init_database as init_db_func
-
-        init_db_func()  # Ensure DB is initialized
-
-        # Check OAuth DB for an active token
-        db = get_db_session()
-        try:
-            # Debug: count total tokens
-            total_tokens = db.query(FacebookToken).count()
-            status["database"]["total_tokens"] = total_tokens
-
-            # Check for active (non-revoked) tokens
-            token = db.query(FacebookToken).filter(FacebookToken.revoked == False).order_by(FacebookToken.created_at.desc()).first()
-            if token:
-                # Check expiration
-                from datetime import datetime, timezone
-                expires_at = token.expires_at
-                if expires_at and expires_at.tzinfo is None:
-                    expires_at = expires_at.replace(tzinfo=timezone.utc)
-
-                is_expired = expires_at and expires_at < datetime.now(timezone.utc) if expires_at else False
-
-                status["oauth"] = {
-                    "present": True,
-                    "fb_user_id": token.fb_user_id,
-                    "expires_at": token.expires_at.isoformat() if token.expires_at else None,
-                    "is_expired": is_expired,
-                    "accounts_count": len(token.accounts) if token.accounts else 0,
-                    "permissions": token.permissions if hasattr(token, 'permissions') else []
-                }
-            else:
-                status["oauth"] = {"present": False}
-                # Debug: check if there are any tokens at all
-                any_token = db.query(FacebookToken).first()
-                if any_token:
-                    status["oauth"]["debug"] = f"Found {total_tokens} total token(s) but all are revoked"
-                else:
-                    status["oauth"]["debug"] = "No tokens found in database at all"
-        except Exception as db_error:
-            status["oauth"] = {"present": False, "error": str(db_error)}
-        finally:
-            db.close()
+        # Database access blocks, so keep it off the event loop
+        await asyncio.to_thread(_load_oauth_status, status)
 
         # Check env token
-        import os
         env_token = os.getenv("META_ACCESS_TOKEN")
         status["env_token_present"] = bool(env_token)
 
@@ -377,72 +372,58 @@ def token_status() -> str:
         ]
         status["will_use"] = "oauth_managed_token" if status["oauth"].get("present") else ("env_token" if status["env_token_present"] else "none")
 
-        return json.dumps(status, indent=2)
+        return status
     except Exception as e:
-        import traceback
-        return json.dumps({"success": False, "error": str(e), "traceback": traceback.format_exc()}, indent=2)
+        return {"success": False, "error": str(e), "traceback": traceback.format_exc()}
 
 
 @mcp.tool()
-def db_config() -> str:
+def db_config() -> Dict[str, Any]:
     """Show the DATABASE_URL the MCP server is using and resolved SQLite path (if applicable)."""
+    info = {"success": True, "DATABASE_URL": settings.database_url}
     try:
-        from .config.settings import settings as s_abs
-    except Exception:
-        from config.settings import settings as s_abs
-
-    info = {"success": True, "DATABASE_URL": s_abs.database_url}
-    try:
-        if s_abs.database_url.startswith("sqlite"):
+        if settings.database_url.startswith("sqlite"):
             # Extract file path for convenience
-            path = s_abs.database_url.replace("sqlite:///", "")
+            path = settings.database_url.replace("sqlite:///", "")
             info["sqlite_path"] = path
     except Exception:
         pass
-    return json.dumps(info, indent=2)
+    return info
 
 
 @mcp.tool()
-def clear_database() -> str:
+async def clear_database() -> Dict[str, Any]:
     """Clear all OAuth tokens from the database. WARNING: This deletes all stored tokens!"""
     try:
-        from .auth.database import clear_oauth_tokens
-    except ImportError:
-        from auth.database import clear_oauth_tokens
-    
-    try:
-        count = clear_oauth_tokens()
-        return json.dumps({
+        count = await asyncio.to_thread(clear_oauth_tokens)
+        oauth_service.mark_tokens_changed()
+        return {
             "success": True,
             "message": f"Cleared {count} OAuth token(s) from database",
             "tokens_deleted": count
-        }, indent=2)
+        }
     except Exception as e:
-        return json.dumps({
+        return {
             "success": False,
             "error": str(e)
-        }, indent=2)
+        }
 
 
 @mcp.tool()
-def reset_database() -> str:
+async def reset_database() -> Dict[str, Any]:
     """Reset the entire database (drops and recreates all tables). WARNING: This deletes ALL data!"""
     try:
-        from .auth.database import reset_database
-    except ImportError:
-        from auth.database import reset_database
-    
-    try:
-        success = reset_database()
-        return json.dumps({
+        success = await asyncio.to_thread(_reset_database)
+        oauth_service.mark_tokens_changed()
+        return {
             "success": success,
             "message": "Database reset successfully" if success else "Database reset failed"
-        }, indent=2)
+        }
     except Exception as e:
-        return json.dumps({
+        return {
             "success": False,
             "error": str(e)
-        }, indent=2)
+        }
 
 
 # =======================
@@ -452,43 +433,12 @@ def reset_database() -> str:
 # Duplicate function removed - using the one above
 
 @mcp.tool()
-def get_interest_suggestions(interest_list: List[str], limit: int = 25) -> str:
-    """Get interest suggestions based on existing interests."""
-    try:
-        from .tools.targeting import get_interest_suggestions
-    except ImportError:
-        from tools.targeting import get_interest_suggestions
-
-    validated_get_interest_suggestions = create_validation_wrapper(get_interest_suggestions, 'get_interest_suggestions')
-    result = validated_get_interest_suggestions(interest_list=interest_list, limit=limit)
-    return json.dumps(result, indent=2)
-
-@mcp.tool()
-def validate_interests(interest_list: List[str] = None, interest_fbid_list: List[str] = None) -> str:
+async def validate_interests(interest_list: List[str] = None, interest_fbid_list: List[str] = None) -> Dict[str, Any]:
     """Validate interest names or IDs for targeting."""
-    try:
-        from .tools.targeting import validate_interests
-    except ImportError:
-        from tools.targeting import validate_interests
-
-    validated_validate_interests = create_validation_wrapper(validate_interests, 'validate_interests')
-    result = validated_validate_interests(interest_list=interest_list, interest_fbid_list=interest_fbid_list)
-    return json.dumps(result, indent=2)
+    return await asyncio.to_thread(_VALIDATED['validate_interests'], interest_list=interest_list, interest_fbid_list=interest_fbid_list)
 
 @mcp.tool()
-def estimate_audience_size(account_id: str, targeting: Dict[str, Any], optimization_goal: str = "REACH") -> str:
-    """Estimate audience size for targeting specifications."""
-    try:
-        from .tools.targeting import estimate_audience_size
-    except ImportError:
-        from tools.targeting import estimate_audience_size
-
-    validated_estimate_audience_size = create_validation_wrapper(estimate_audience_size, 'estimate_audience_size')
-    result = validated_estimate_audience_size(account_id=account_id, targeting=targeting, optimization_goal=optimization_goal)
-    return json.dumps(result, indent=2)
-
-@mcp.tool()
-def search_behaviors(behavior_class: str = "behaviors", limit: int = 50) -> str:
+async def search_behaviors(behavior_class: str = "behaviors", limit: int = 50) -> Dict[str, Any]:
     """
     Get behavior targeting options by class.
 
@@ -497,41 +447,20 @@ def search_behaviors(behavior_class: str = "behaviors", limit: int = 50) -> str:
                        'family_statuses', 'life_events' (default: 'behaviors')
         limit: Maximum number of results to return (default: 50)
     """
-    try:
-        from .tools.targeting import search_behaviors
-    except ImportError:
-        from tools.targeting import search_behaviors
-
-    validated_search_behaviors = create_validation_wrapper(search_behaviors, 'search_behaviors')
-    result = validated_search_behaviors(behavior_class=behavior_class, limit=limit)
-    return json.dumps(result, indent=2)
+    return await asyncio.to_thread(_VALIDATED['search_behaviors'], behavior_class=behavior_class, limit=limit)
 
 # Duplicate function removed - using the one above
 
 @mcp.tool()
-def search_geo_locations(query: str, location_types: List[str] = None, limit: int = 25) -> str:
+async def search_geo_locations(query: str, location_types: List[str] = None, limit: int = 25) -> Dict[str, Any]:
     """Search for geographic targeting locations."""
-    try:
-        from .tools.targeting import search_geo_locations
-    except ImportError:
-        from tools.targeting import search_geo_locations
-
-    validated_search_geo_locations = create_validation_wrapper(search_geo_locations, 'search_geo_locations')
-    result = validated_search_geo_locations(query=query, location_types=location_types, limit=limit)
-    return json.dumps(result, indent=2)
+    return await asyncio.to_thread(_VALIDATED['search_geo_locations'], query=query, location_types=location_types, limit=limit)
 
 
 @mcp.tool()
-def analyze_campaigns(account_id: str, time_range: str = "last_30d", focus: str = None) -> str:
+async def analyze_campaigns(account_id: str, time_range: str = "last_30d", focus: str = None) -> Dict[str, Any]:
     """AI-powered campaign analysis with recommendations."""
-    try:
-        from .core.analyzer import analyze_campaigns
-    except ImportError:
-        from core.analyzer import analyze_campaigns
-
-    validated_analyze_campaigns = create_validation_wrapper(analyze_campaigns, 'analyze_campaigns')
-    result = validated_analyze_campaigns(account_id=account_id, time_range=time_range, focus=focus)
-    return json.dumps(result, indent=2)
+    return await asyncio.to_thread(_VALIDATED['analyze_campaigns'], account_id=account_id, time_range=time_range, focus=focus)
 
 def main():
     """Main entry point for the MCP server."""
@@ -546,18 +475,15 @@ def main():
         print("Starting Meta Ads MCP Server...", file=sys.stderr)
 
         # Initialize database (for OAuth token storage)
-        try:
-            from .auth.database import init_database
-        except ImportError:
-            from auth.database import init_database
         init_database()
         print("Database initialized", file=sys.stderr)
 
         # Check if token is configured (log to stderr)
-        # Check both OAuth token and environment token
+        # Check both OAuth token and environment token; the OAuth lookup
+        # primes token_manager's cache for the first tool call
         has_oauth_token = False
         try:
-            token = oauth_service.get_token()
+            token = token_manager.get_oauth_token()
             if token:
                 has_oauth_token = True
                 print(f"OAuth token found in database", file=sys.stderr)
@@ -575,7 +501,6 @@ def main():
         print("Server stopped by user", file=sys.stderr)
     except Exception as e:
         print(f"Server error: {e}", file=sys.stderr)
-        import traceback
         traceback.print_exc(file=sys.stderr)
         sys.exit(1)
 
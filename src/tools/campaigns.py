@@ -215,10 +215,10 @@ def create_campaign(
             'status': status
         })
 
-        if not validation['valid']:
+        if not validation.valid:
             return {
                 "success": False,
-                "error": f"Validation failed: {validation['errors']}"
+                "error": f"Validation failed: {validation.errors}"
             }
 
         # Get token from token manager or settings
@@ -2,6 +2,8 @@
 Logging configuration for Meta Ads MCP server.
 """
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Optional
 
@@ -65,5 +67,58 @@ def setup_logger(name: str = "meta-ads-mcp", level: Optional[str] = None) -> log
     return logger
 
 
+# Listener draining the log queue while queue logging is enabled
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def enable_queue_logging(target: Optional[logging.Logger] = None) -> None:
+    """
+    Route log records through a queue so emitting never blocks the caller.
+
+    The logger's current handlers are moved to a background QueueListener
+    thread and replaced by a single QueueHandler.
+
+    Args:
+        target: Logger to reconfigure (defaults to the global logger)
+    """
+    global _queue_listener
+
+    if _queue_listener is not None:
+        return
+
+    target = target or logger
+    handlers = [h for h in target.handlers if not isinstance(h, logging.handlers.QueueHandler)]
+    log_queue: queue.Queue = queue.Queue(-1)
+
+    for handler in handlers:
+        target.removeHandler(handler)
+    target.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+
+def disable_queue_logging(target: Optional[logging.Logger] = None) -> None:
+    """
+    Flush queued records and restore the logger's original handlers.
+
+    Args:
+        target: Logger to restore (defaults to the global logger)
+    """
+    global _queue_listener
+
+    if _queue_listener is None:
+        return
+
+    target = target or logger
+    _queue_listener.stop()
+    for handler in list(target.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            target.removeHandler(handler)
+    for handler in _queue_listener.handlers:
+        target.addHandler(handler)
+    _queue_listener = None
+
+
 # Global logger instance
 logger = setup_logger()